@@ -0,0 +1,313 @@
+import argparse
+import chess
+import mmap
+import os
+import time
+from collections import deque
+
+WIN = 1
+DRAW = 0
+LOSS = -1
+
+MATERIALS = {
+    "KQK": chess.QUEEN,
+    "KRK": chess.ROOK,
+    "KPK": chess.PAWN
+}
+
+# Positions are normalised so the side with the extra piece is White.
+# index = side_to_move * 2^18 + white_king * 4096 + black_king * 64 + piece_square
+SIDE_SIZE = 64 * 64 * 64
+TABLE_SIZE = 2 * SIDE_SIZE
+WHITE_TO_MOVE = 0
+BLACK_TO_MOVE = 1
+
+KING_MOVES = [list(chess.SquareSet(chess.BB_KING_ATTACKS[square])) for square in chess.SQUARES]
+KING_ADJACENT = [chess.BB_KING_ATTACKS[square] for square in chess.SQUARES]
+
+ORTHOGONAL = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+DIAGONAL = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+DIRECTIONS = {
+    chess.ROOK: ORTHOGONAL,
+    chess.QUEEN: ORTHOGONAL + DIAGONAL
+}
+
+
+def _build_rays():
+    rays = {}
+    for piece_type, directions in DIRECTIONS.items():
+        table = []
+        for square in chess.SQUARES:
+            square_rays = []
+            for file_step, rank_step in directions:
+                ray = []
+                file, rank = chess.square_file(square) + file_step, chess.square_rank(square) + rank_step
+                while 0 <= file < 8 and 0 <= rank < 8:
+                    ray.append(chess.square(file, rank))
+                    file, rank = file + file_step, rank + rank_step
+                if ray:
+                    square_rays.append(ray)
+            table.append(square_rays)
+        rays[piece_type] = table
+    return rays
+
+
+RAYS = _build_rays()
+
+
+def table_index(side, white_king, black_king, piece_square):
+    return side * SIDE_SIZE + white_king * 4096 + black_king * 64 + piece_square
+
+
+def slider_targets(piece_type, square, blockers):
+    targets = []
+    for ray in RAYS[piece_type][square]:
+        for target in ray:
+            if blockers & chess.BB_SQUARES[target]:
+                break
+            targets.append(target)
+    return targets
+
+
+def piece_attacks(piece_type, square, target, white_king):
+    # Attacks of the white piece with only the white king as a possible blocker.
+    if piece_type == chess.PAWN:
+        return bool(chess.BB_PAWN_ATTACKS[chess.WHITE][square] & chess.BB_SQUARES[target])
+    for ray in RAYS[piece_type][square]:
+        for ray_square in ray:
+            if ray_square == target:
+                return True
+            if ray_square == white_king:
+                break
+    return False
+
+
+def white_attacks(piece_type, white_king, piece_square, target):
+    if KING_ADJACENT[white_king] & chess.BB_SQUARES[target]:
+        return True
+    return piece_attacks(piece_type, piece_square, target, white_king)
+
+
+def is_valid(piece_type, side, white_king, black_king, piece_square):
+    if white_king == black_king or piece_square == white_king or piece_square == black_king:
+        return False
+    if KING_ADJACENT[white_king] & chess.BB_SQUARES[black_king]:
+        return False
+    if piece_type == chess.PAWN and chess.square_rank(piece_square) in (0, 7):
+        return False
+    if side == WHITE_TO_MOVE and piece_attacks(piece_type, piece_square, black_king, white_king):
+        return False
+    return True
+
+
+def white_moves(piece_type, white_king, black_king, piece_square):
+    # Yields (white_king, piece_square, promotion) for every legal White move.
+    for target in KING_MOVES[white_king]:
+        if target == piece_square or KING_ADJACENT[black_king] & chess.BB_SQUARES[target]:
+            continue
+        yield target, piece_square, None
+
+    if piece_type == chess.PAWN:
+        occupied = chess.BB_SQUARES[white_king] | chess.BB_SQUARES[black_king]
+        one_step = piece_square + 8
+        if not occupied & chess.BB_SQUARES[one_step]:
+            if chess.square_rank(one_step) == 7:
+                yield white_king, one_step, chess.QUEEN
+                yield white_king, one_step, chess.ROOK
+            else:
+                yield white_king, one_step, None
+                two_step = piece_square + 16
+                if chess.square_rank(piece_square) == 1 and not occupied & chess.BB_SQUARES[two_step]:
+                    yield white_king, two_step, None
+    else:
+        blockers = chess.BB_SQUARES[white_king] | chess.BB_SQUARES[black_king]
+        for target in slider_targets(piece_type, piece_square, blockers):
+            yield white_king, target, None
+
+
+def white_unmoves(piece_type, white_king, black_king, piece_square):
+    # Inverse of white_moves (without promotions): positions White could have moved from.
+    for origin in KING_MOVES[white_king]:
+        if origin == piece_square or origin == black_king or KING_ADJACENT[black_king] & chess.BB_SQUARES[origin]:
+            continue
+        yield origin, piece_square
+
+    if piece_type == chess.PAWN:
+        rank = chess.square_rank(piece_square)
+        occupied = chess.BB_SQUARES[white_king] | chess.BB_SQUARES[black_king]
+        one_back = piece_square - 8
+        if rank >= 2 and not occupied & chess.BB_SQUARES[one_back]:
+            yield white_king, one_back
+            two_back = piece_square - 16
+            if rank == 3 and not occupied & chess.BB_SQUARES[two_back]:
+                yield white_king, two_back
+    else:
+        blockers = chess.BB_SQUARES[white_king] | chess.BB_SQUARES[black_king]
+        for origin in slider_targets(piece_type, piece_square, blockers):
+            yield white_king, origin
+
+
+def black_moves(piece_type, white_king, black_king, piece_square):
+    # Returns (legal king targets, can_capture_piece).
+    targets = []
+    can_capture = False
+    for target in KING_MOVES[black_king]:
+        if KING_ADJACENT[white_king] & chess.BB_SQUARES[target]:
+            continue
+        if target == piece_square:
+            can_capture = True
+            continue
+        if not piece_attacks(piece_type, piece_square, target, white_king):
+            targets.append(target)
+    return targets, can_capture
+
+
+def generate(piece_type, promotion_tables=None):
+    wins = bytearray(TABLE_SIZE)
+    remaining = [0] * SIDE_SIZE
+    queue = deque()
+
+    for white_king in chess.SQUARES:
+        for black_king in chess.SQUARES:
+            for piece_square in chess.SQUARES:
+                if not is_valid(piece_type, BLACK_TO_MOVE, white_king, black_king, piece_square):
+                    continue
+                position = white_king * 4096 + black_king * 64 + piece_square
+                targets, can_capture = black_moves(piece_type, white_king, black_king, piece_square)
+                if can_capture:
+                    remaining[position] = -1
+                elif targets:
+                    remaining[position] = len(targets)
+                elif white_attacks(piece_type, white_king, piece_square, black_king):
+                    wins[SIDE_SIZE + position] = 1
+                    queue.append(SIDE_SIZE + position)
+                else:
+                    remaining[position] = -1
+
+    if piece_type == chess.PAWN:
+        for white_king in chess.SQUARES:
+            for black_king in chess.SQUARES:
+                for piece_square in chess.SquareSet(chess.BB_RANK_7):
+                    if not is_valid(piece_type, WHITE_TO_MOVE, white_king, black_king, piece_square):
+                        continue
+                    for king, square, promotion in white_moves(piece_type, white_king, black_king, piece_square):
+                        if promotion and promotion_tables[promotion][table_index(BLACK_TO_MOVE, king, black_king,
+                                                                                 square)]:
+                            index = table_index(WHITE_TO_MOVE, white_king, black_king, piece_square)
+                            wins[index] = 1
+                            queue.append(index)
+                            break
+
+    while queue:
+        index = queue.popleft()
+        side, position = divmod(index, SIDE_SIZE)
+        white_king, rest = divmod(position, 4096)
+        black_king, piece_square = divmod(rest, 64)
+
+        if side == BLACK_TO_MOVE:
+            for origin_king, origin_square in white_unmoves(piece_type, white_king, black_king, piece_square):
+                if not is_valid(piece_type, WHITE_TO_MOVE, origin_king, black_king, origin_square):
+                    continue
+                parent = table_index(WHITE_TO_MOVE, origin_king, black_king, origin_square)
+                if not wins[parent]:
+                    wins[parent] = 1
+                    queue.append(parent)
+        else:
+            for origin in KING_MOVES[black_king]:
+                if origin == piece_square or origin == white_king:
+                    continue
+                if KING_ADJACENT[white_king] & chess.BB_SQUARES[origin]:
+                    continue
+                parent = white_king * 4096 + origin * 64 + piece_square
+                if remaining[parent] <= 0:
+                    continue
+                remaining[parent] -= 1
+                if remaining[parent] == 0:
+                    wins[SIDE_SIZE + parent] = 1
+                    queue.append(SIDE_SIZE + parent)
+
+    return wins
+
+
+def pack(wins):
+    packed = bytearray(len(wins) // 8)
+    for index, win in enumerate(wins):
+        if win:
+            packed[index >> 3] |= 1 << (index & 7)
+    return packed
+
+
+def generate_all(output_dir):
+    os.makedirs(output_dir, exist_ok=True)
+    tables = {}
+    for name in ("KQK", "KRK", "KPK"):
+        start = time.perf_counter()
+        piece_type = MATERIALS[name]
+        wins = generate(piece_type, tables)
+        tables[piece_type] = wins
+        path = os.path.join(output_dir, f"{name}.bin")
+        with open(path, "wb") as f:
+            f.write(pack(wins))
+        print(f"{name}: {sum(wins)} winning positions, {time.perf_counter() - start:.1f}s -> {path}")
+
+
+class Bitbases:
+    def __init__(self, directory):
+        self.directory = directory
+        self.tables = {}
+        self.files = []
+        self.probes = 0
+        self.hits = 0
+        for name, piece_type in MATERIALS.items():
+            path = os.path.join(directory, f"{name}.bin")
+            if not os.path.exists(path):
+                continue
+            f = open(path, "rb")
+            self.files.append(f)
+            self.tables[piece_type] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    def is_loaded(self):
+        return bool(self.tables)
+
+    def close(self):
+        for table in self.tables.values():
+            table.close()
+        for f in self.files:
+            f.close()
+        self.tables = {}
+        self.files = []
+
+    def probe(self, board):
+        if chess.popcount(board.occupied) != 3:
+            return None
+        self.probes += 1
+        for piece_type, table in self.tables.items():
+            for strong in chess.COLORS:
+                piece_mask = board.pieces_mask(piece_type, strong)
+                if piece_mask:
+                    self.hits += 1
+                    return self.probe_squares(table, piece_type, strong, board.turn, board.king(strong),
+                                              board.king(not strong), chess.lsb(piece_mask))
+        return None
+
+    @staticmethod
+    def probe_squares(table, piece_type, strong, turn, strong_king, weak_king, piece_square):
+        if strong == chess.BLACK:
+            # Mirror ranks so the strong side plays "up" the board as White.
+            strong_king, weak_king, piece_square = strong_king ^ 56, weak_king ^ 56, piece_square ^ 56
+        side = WHITE_TO_MOVE if turn == strong else BLACK_TO_MOVE
+        index = table_index(side, strong_king, weak_king, piece_square)
+        if not table[index >> 3] & (1 << (index & 7)):
+            return DRAW
+        return WIN if side == WHITE_TO_MOVE else LOSS
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate KQK, KRK and KPK bitbases by retrograde analysis.")
+    parser.add_argument("--output", default="assets/bitbases")
+    args = parser.parse_args()
+    generate_all(args.output)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,321 @@
+import chess
+import importlib.util
+from abc import ABC, abstractmethod
+from ai.search_board import BLACK_OFFSET, CASTLING, CASTLING_ROOKS, EN_PASSANT, FLAG_SHIFT, PROMOTION_SHIFT
+
+# numpy is optional and only needed by BatchEvaluator, so it is imported on first use rather than at start-up.
+HAVE_NUMPY = importlib.util.find_spec("numpy") is not None
+np = None
+
+
+def _load_numpy():
+    global np
+    if np is None:
+        if not HAVE_NUMPY:
+            raise ImportError("The batch evaluator needs numpy (pip install numpy).")
+        import numpy
+        np = numpy
+    return np
+
+
+class Evaluator(ABC):
+    # Batched evaluators score all children of a depth-1 node at once through evaluate_moves.
+    batched = False
+
+    @abstractmethod
+    def evaluate(self, board):
+        pass
+
+    # Incremental hooks used by the search. The defaults simply re-evaluate at every leaf.
+    def begin(self, board):
+        pass
+
+    def push(self, board, move):
+        pass
+
+    def pop(self):
+        pass
+
+    def current(self, board):
+        return self.evaluate(board)
+
+
+class MaterialEvaluator(Evaluator):
+    def __init__(self):
+        self.piece_values = {
+            chess.PAWN: 10,
+            chess.KNIGHT: 30,
+            chess.BISHOP: 30,
+            chess.ROOK: 50,
+            chess.QUEEN: 90,
+            chess.KING: 900
+        }
+
+    def evaluate(self, board):
+        score = 0
+        for piece_type, value in self.piece_values.items():
+            score += value * (chess.popcount(board.pieces_mask(piece_type, board.turn)) -
+                              chess.popcount(board.pieces_mask(piece_type, not board.turn)))
+        return score
+
+
+class LegacyMaterialEvaluator(MaterialEvaluator):
+    # The original 64-square piece_at scan, kept for comparison. Works on chess.Board and SearchBoard alike.
+    def evaluate(self, board):
+        score = 0
+        for square in chess.SQUARES:
+            piece = board.piece_at(square)
+            if piece:
+                value = self.piece_values.get(piece.piece_type, 0)
+                if piece.color == board.turn:
+                    score += value
+                else:
+                    score -= value
+        return score
+
+
+PIECE_VALUES = {
+    chess.PAWN: 100,
+    chess.KNIGHT: 320,
+    chess.BISHOP: 330,
+    chess.ROOK: 500,
+    chess.QUEEN: 900,
+    chess.KING: 0
+}
+
+# Piece-square tables from White's point of view, listed from a8 to h1.
+PIECE_SQUARE_TABLES = {
+    chess.PAWN: [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        50, 50, 50, 50, 50, 50, 50, 50,
+        10, 10, 20, 30, 30, 20, 10, 10,
+        5, 5, 10, 25, 25, 10, 5, 5,
+        0, 0, 0, 20, 20, 0, 0, 0,
+        5, -5, -10, 0, 0, -10, -5, 5,
+        5, 10, 10, -20, -20, 10, 10, 5,
+        0, 0, 0, 0, 0, 0, 0, 0
+    ],
+    chess.KNIGHT: [
+        -50, -40, -30, -30, -30, -30, -40, -50,
+        -40, -20, 0, 0, 0, 0, -20, -40,
+        -30, 0, 10, 15, 15, 10, 0, -30,
+        -30, 5, 15, 20, 20, 15, 5, -30,
+        -30, 0, 15, 20, 20, 15, 0, -30,
+        -30, 5, 10, 15, 15, 10, 5, -30,
+        -40, -20, 0, 5, 5, 0, -20, -40,
+        -50, -40, -30, -30, -30, -30, -40, -50
+    ],
+    chess.BISHOP: [
+        -20, -10, -10, -10, -10, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 10, 10, 5, 0, -10,
+        -10, 5, 5, 10, 10, 5, 5, -10,
+        -10, 0, 10, 10, 10, 10, 0, -10,
+        -10, 10, 10, 10, 10, 10, 10, -10,
+        -10, 5, 0, 0, 0, 0, 5, -10,
+        -20, -10, -10, -10, -10, -10, -10, -20
+    ],
+    chess.ROOK: [
+        0, 0, 0, 0, 0, 0, 0, 0,
+        5, 10, 10, 10, 10, 10, 10, 5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        -5, 0, 0, 0, 0, 0, 0, -5,
+        0, 0, 0, 5, 5, 0, 0, 0
+    ],
+    chess.QUEEN: [
+        -20, -10, -10, -5, -5, -10, -10, -20,
+        -10, 0, 0, 0, 0, 0, 0, -10,
+        -10, 0, 5, 5, 5, 5, 0, -10,
+        -5, 0, 5, 5, 5, 5, 0, -5,
+        0, 0, 5, 5, 5, 5, 0, -5,
+        -10, 5, 5, 5, 5, 5, 0, -10,
+        -10, 0, 5, 0, 0, 0, 0, -10,
+        -20, -10, -10, -5, -5, -10, -10, -20
+    ],
+    chess.KING: [
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -30, -40, -40, -50, -50, -40, -40, -30,
+        -20, -30, -30, -40, -40, -30, -30, -20,
+        -10, -20, -20, -20, -20, -20, -20, -10,
+        20, 20, 0, 0, 0, 0, 20, 20,
+        20, 30, 10, 0, 0, 10, 30, 20
+    ]
+}
+
+
+def _build_square_scores():
+    # SQUARE_SCORES[color][piece_type][square] is the signed piece-square term from White's side.
+    scores = {chess.WHITE: {}, chess.BLACK: {}}
+    for piece_type, table in PIECE_SQUARE_TABLES.items():
+        scores[chess.WHITE][piece_type] = [table[square ^ 56] for square in chess.SQUARES]
+        scores[chess.BLACK][piece_type] = [-table[square] for square in chess.SQUARES]
+    return scores
+
+
+SQUARE_SCORES = _build_square_scores()
+
+
+class BitboardEvaluator(Evaluator):
+    def __init__(self):
+        self.stack = []
+
+    def evaluate_white(self, board):
+        score = 0
+        for piece_type in chess.PIECE_TYPES:
+            white_mask = board.pieces_mask(piece_type, chess.WHITE)
+            black_mask = board.pieces_mask(piece_type, chess.BLACK)
+            score += PIECE_VALUES[piece_type] * (chess.popcount(white_mask) - chess.popcount(black_mask))
+
+            white_table = SQUARE_SCORES[chess.WHITE][piece_type]
+            for square in chess.scan_forward(white_mask):
+                score += white_table[square]
+            black_table = SQUARE_SCORES[chess.BLACK][piece_type]
+            for square in chess.scan_forward(black_mask):
+                score += black_table[square]
+        return score
+
+    def evaluate(self, board):
+        score = self.evaluate_white(board)
+        return score if board.turn == chess.WHITE else -score
+
+    def begin(self, board):
+        self.stack = [self.evaluate_white(board)]
+
+    def push(self, board, move):
+        # board is the SearchBoard the search runs on and move is its integer encoding.
+        color = board.turn
+        sign = 1 if color == chess.WHITE else -1
+        own = SQUARE_SCORES[color]
+        enemy = SQUARE_SCORES[not color]
+        from_square = move & 63
+        to_square = (move >> 6) & 63
+        flag = move >> FLAG_SHIFT
+        piece_type = board.squares[from_square] & 7
+        placed_type = (move >> PROMOTION_SHIFT) & 7 or piece_type
+
+        delta = own[placed_type][to_square] - own[piece_type][from_square]
+        delta += sign * (PIECE_VALUES[placed_type] - PIECE_VALUES[piece_type])
+
+        if flag == CASTLING:
+            rook_from, rook_to = CASTLING_ROOKS[to_square]
+            delta += own[chess.ROOK][rook_to] - own[chess.ROOK][rook_from]
+        elif flag == EN_PASSANT:
+            captured_square = to_square - 8 if color == chess.WHITE else to_square + 8
+            delta -= enemy[chess.PAWN][captured_square] - sign * PIECE_VALUES[chess.PAWN]
+        else:
+            captured_type = board.squares[to_square] & 7
+            if captured_type:
+                delta -= enemy[captured_type][to_square] - sign * PIECE_VALUES[captured_type]
+
+        self.stack.append(self.stack[-1] + delta)
+
+    def pop(self):
+        self.stack.pop()
+
+    def current(self, board):
+        score = self.stack[-1]
+        return score if board.turn == chess.WHITE else -score
+
+
+def _feature_offsets():
+    # Feature rows are White pawn..king then Black pawn..king, 64 squares each, indexed by piece code.
+    offsets = [0] * 16
+    for piece_type in chess.PIECE_TYPES:
+        offsets[piece_type] = (piece_type - 1) * 64
+        offsets[piece_type + BLACK_OFFSET] = (piece_type + 5) * 64
+    return offsets
+
+
+FEATURE_OFFSETS = _feature_offsets()
+
+
+def default_weights():
+    # 12x64 White-signed weights: material plus piece-square terms, the same numbers BitboardEvaluator uses.
+    _load_numpy()
+    rows = []
+    for color, sign in ((chess.WHITE, 1), (chess.BLACK, -1)):
+        for piece_type in chess.PIECE_TYPES:
+            rows.append([SQUARE_SCORES[color][piece_type][square] + sign * PIECE_VALUES[piece_type]
+                         for square in chess.SQUARES])
+    return np.array(rows, dtype=np.int32)
+
+
+class BatchEvaluator(Evaluator):
+    batched = True
+
+    def __init__(self, weights=None):
+        _load_numpy()
+        if weights is None:
+            weights = default_weights()
+        elif isinstance(weights, str):
+            weights = np.load(weights)
+        self.weights = np.asarray(weights).reshape(12 * 64)
+        self.offsets = np.array(FEATURE_OFFSETS)
+
+    def features(self, board):
+        masks = [board.pieces_mask(piece_type, color) for color in (chess.WHITE, chess.BLACK)
+                 for piece_type in chess.PIECE_TYPES]
+        bits = np.unpackbits(np.array(masks, dtype="<u8").view(np.uint8), bitorder="little")
+        return bits.astype(self.weights.dtype)
+
+    def score(self, features):
+        # White-signed score of a 768-feature vector (or a batch of them, one per row).
+        return features @ self.weights
+
+    def evaluate(self, board):
+        score = int(self.score(self.features(board)))
+        return score if board.turn == chess.WHITE else -score
+
+    def evaluate_moves(self, board, moves):
+        # The model is linear in the 12x64 features, so a child differs from its parent only by the
+        # weights of the moved, captured and castling-rook squares; the whole batch is a few array ops.
+        weights = self.weights
+        offsets = self.offsets
+        squares = np.array(board.squares)
+        encoded = np.array(moves)
+        from_squares = encoded & 63
+        to_squares = (encoded >> 6) & 63
+        promotions = (encoded >> PROMOTION_SHIFT) & 7
+        pieces = squares[from_squares]
+        placed = np.where(promotions, promotions + (pieces & BLACK_OFFSET), pieces)
+        victims = squares[to_squares]
+
+        scores = weights[offsets[placed] + to_squares] - weights[offsets[pieces] + from_squares]
+        scores -= weights[offsets[victims] + to_squares] * (victims != 0)
+        scores += self.score(self.features(board))
+
+        for row in np.flatnonzero(encoded >> FLAG_SHIFT >= EN_PASSANT):
+            move = moves[row]
+            to_square = (move >> 6) & 63
+            if move >> FLAG_SHIFT == CASTLING:
+                rook_from, rook_to = CASTLING_ROOKS[to_square]
+                rook = board.squares[rook_from]
+                scores[row] += weights[FEATURE_OFFSETS[rook] + rook_to] - weights[FEATURE_OFFSETS[rook] + rook_from]
+            else:
+                captured_square = to_square - 8 if board.turn == chess.WHITE else to_square + 8
+                scores[row] -= weights[FEATURE_OFFSETS[board.squares[captured_square]] + captured_square]
+
+        # Scores are returned from the side to move in each child.
+        return (-scores if board.turn == chess.WHITE else scores).tolist()
+
+
+EVALUATORS = {
+    "legacy": LegacyMaterialEvaluator,
+    "material": MaterialEvaluator,
+    "bitboard": BitboardEvaluator
+}
+if HAVE_NUMPY:
+    EVALUATORS["batch"] = BatchEvaluator
+
+
+def create_evaluator(evaluator):
+    if isinstance(evaluator, Evaluator):
+        return evaluator
+    if evaluator not in EVALUATORS:
+        raise ValueError(f"Unknown evaluator '{evaluator}'. Choose from: {', '.join(EVALUATORS)}")
+    return EVALUATORS[evaluator]()
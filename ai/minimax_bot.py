@@ -1,34 +1,192 @@
 import chess
 import math
+import queue
 import random
+import threading
+import time
+from ai.bitbase import Bitbases, DRAW, WIN
+from ai.evaluation import create_evaluator
+from ai.move_ordering import MoveOrderer
+from ai.parallel_search import ParallelRootSearch
+from ai.search_board import SearchBoard, decode_move
+from ai.search_stats import build_search_stats, SearchStatsLog
 from ai.strategy_interface import AIStrategy
+from ai.transposition import TranspositionTable, EXACT, LOWER_BOUND, UPPER_BOUND
+from core.events import game_events
+from core.settings import AI_TIME_FRACTION, AI_MIN_MOVE_TIME, AI_MAX_MOVE_TIME, AI_MAX_CLOCK_FRACTION, BITBASE_DIR
+
+MAX_SEARCH_DEPTH = 32
+CHECK_INTERVAL = 256
+MATE_SCORE = 100000
+MATE_THRESHOLD = MATE_SCORE - 1000
+BITBASE_WIN_SCORE = 50000
+CENTER_DISTANCE = [max(3 - min(chess.square_file(sq), 7 - chess.square_file(sq)),
+                       3 - min(chess.square_rank(sq), 7 - chess.square_rank(sq))) for sq in chess.SQUARES]
+
+
+class SearchAborted(Exception):
+    pass
 
 
 class MinimaxBot(AIStrategy):
-    def __init__(self, depth=3):
+    def __init__(self, depth=3, tt_size_mb=16, max_depth=MAX_SEARCH_DEPTH, evaluator="bitboard", workers=1,
+                 bitbase_dir=BITBASE_DIR, telemetry=False, stats_log=None):
         self.depth = depth
-        self.piece_values = {
-            chess.PAWN: 10,
-            chess.KNIGHT: 30,
-            chess.BISHOP: 30,
-            chess.ROOK: 50,
-            chess.QUEEN: 90,
-            chess.KING: 900
-        }
-
-    def get_move(self, board):
+        self.max_depth = max_depth
+        self.tt_size_mb = tt_size_mb
+        self.evaluator_name = evaluator
+        self.evaluator = create_evaluator(evaluator)
+        self.batched = self.evaluator.batched
+        self.bitbase_dir = bitbase_dir
+        self.bitbases = Bitbases(bitbase_dir) if bitbase_dir else None
+        if self.bitbases is not None and not self.bitbases.is_loaded():
+            self.bitbases = None
+        self.parallel = ParallelRootSearch(self, workers) if workers > 1 else None
+        self.tt = TranspositionTable(tt_size_mb)
+        self.orderer = MoveOrderer()
+        self.telemetry = telemetry
+        self.stats_log = SearchStatsLog(stats_log) if stats_log else None
+        self.last_stats = None
+        self.pending_stats = queue.SimpleQueue()
+        self.nodes = 0
+        self.leaf_nodes = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.completed_depth = 0
+        self.best_value = None
+        self.deadline = None
+        self.node_limit = None
+        self.stop_event = None
+        # Held for the whole of a search, so the tables are never cleared under a running one.
+        self.search_lock = threading.Lock()
+
+    @staticmethod
+    def budget_from_clock(remaining):
+        # The minimum move time never takes more than a fraction of what is left on the clock.
+        budget = min(AI_MAX_MOVE_TIME, max(AI_MIN_MOVE_TIME, remaining * AI_TIME_FRACTION))
+        return min(budget, remaining * AI_MAX_CLOCK_FRACTION)
+
+    def on_game_reset(self, data=None):
+        # A search that was only just cancelled would still write the old game into the cleared tables, so it
+        # is stopped and waited for first; it notices within CHECK_INTERVAL nodes.
+        self.stop()
+        with self.search_lock:
+            self.tt.clear()
+            self.orderer.clear()
+            if self.parallel is not None:
+                self.parallel.clear()
+
+    def get_tt_stats(self):
+        return self.tt.stats()
+
+    def stop(self):
+        if self.stop_event is not None:
+            self.stop_event.set()
+
+    def set_time_limit(self, time_limit):
+        self.deadline = time.perf_counter() + time_limit
+
+    def get_move_cancellable(self, board, stop_event, **kwargs):
+        return self.get_move(board, stop_event=stop_event, **kwargs)
+
+    def get_move(self, board, time_limit=None, node_limit=None, stop_event=None):
+        with self.search_lock:
+            return self.search_move(board, time_limit, node_limit, stop_event)
+
+    def search_move(self, board, time_limit, node_limit, stop_event):
+        # The search runs on a SearchBoard with integer moves; only the result is converted back.
+        search_board = SearchBoard(board)
+        legal_moves = search_board.legal_moves()
+        if not legal_moves:
+            return None
+        random.shuffle(legal_moves)
+        self.prepare_search(time_limit, node_limit, stop_event)
+        search_start = time.perf_counter()
+        tt_probes, tt_hits = self.tt.probes, self.tt.hits
+        iterations = []
+
+        if time_limit is None and node_limit is None:
+            depths = [self.depth]
+        else:
+            depths = range(1, self.max_depth + 1)
+
+        self.evaluator.begin(search_board)
+        root_key = search_board.hash
+        best_move = None
+        for depth in depths:
+            entry = self.tt.probe(root_key)
+            hash_move = entry.move if entry is not None else None
+            legal_moves = self.orderer.order(search_board, legal_moves, 0, hash_move)
+            if best_move is None:
+                best_move = legal_moves[0]
+            try:
+                if self.parallel is not None:
+                    move, value = self.parallel.search_root(board, legal_moves, depth)
+                else:
+                    move, value = self.search_root(search_board, legal_moves, depth)
+            except SearchAborted:
+                while search_board.ply:
+                    search_board.unmake()
+                self.evaluator.begin(search_board)
+                break
+            best_move = move
+            self.best_value = value
+            self.completed_depth = depth
+            self.tt.store(root_key, depth, value, EXACT, move)
+            iterations.append({"depth": depth, "time": time.perf_counter() - search_start, "nodes": self.nodes,
+                               "score": value, "move": decode_move(move).uci()})
+
+        self.deadline = None
+        self.node_limit = None
+        best_move = decode_move(best_move)
+        if self.telemetry or self.stats_log is not None:
+            self.report_stats(board, best_move, iterations, time.perf_counter() - search_start, tt_probes, tt_hits)
+        return best_move
+
+    def report_stats(self, board, move, iterations, elapsed, tt_probes, tt_hits):
+        self.last_stats = build_search_stats(self, board, move, iterations, elapsed, tt_probes, tt_hits)
+        if self.telemetry:
+            # Listeners run on the main thread: stats from a background search wait for publish_stats().
+            if threading.current_thread() is threading.main_thread():
+                game_events.trigger("search_stats", self.last_stats)
+            else:
+                self.pending_stats.put(self.last_stats)
+        if self.stats_log is not None:
+            self.stats_log.append(self.last_stats)
+
+    def publish_stats(self):
+        while True:
+            try:
+                stats = self.pending_stats.get_nowait()
+            except queue.Empty:
+                return
+            game_events.trigger("search_stats", stats)
+
+    def prepare_search(self, time_limit=None, node_limit=None, stop_event=None):
+        self.tt.new_search()
+        self.orderer.new_search()
+        self.nodes = 0
+        self.leaf_nodes = 0
+        self.beta_cutoffs = 0
+        self.first_move_cutoffs = 0
+        self.completed_depth = 0
+        self.best_value = None
+        self.stop_event = stop_event if stop_event is not None else threading.Event()
+        self.deadline = time.perf_counter() + time_limit if time_limit is not None else None
+        self.node_limit = node_limit
+
+    def search_root(self, board, legal_moves, depth):
         best_move = None
         best_value = -math.inf
         alpha = -math.inf
         beta = math.inf
 
-        legal_moves = list(board.legal_moves)
-        random.shuffle(legal_moves)
-
         for move in legal_moves:
-            board.push(move)
-            board_value = -self.minimax(board, self.depth - 1, -beta, -alpha)
-            board.pop()
+            self.evaluator.push(board, move)
+            board.make(move)
+            board_value = -self.minimax(board, depth - 1, -beta, -alpha, 1)
+            board.unmake()
+            self.evaluator.pop()
 
             if board_value > best_value:
                 best_value = board_value
@@ -36,34 +194,127 @@ class MinimaxBot(AIStrategy):
 
             alpha = max(alpha, board_value)
 
-        return best_move
+        return best_move, best_value
+
+    def shutdown(self):
+        if self.parallel is not None:
+            self.parallel.shutdown()
+        if self.bitbases is not None:
+            self.bitbases.close()
+
+    def check_limits(self):
+        if self.stop_event.is_set():
+            raise SearchAborted()
+        if self.node_limit is not None and self.nodes >= self.node_limit:
+            raise SearchAborted()
+        if self.deadline is not None and time.perf_counter() >= self.deadline:
+            raise SearchAborted()
+
+    def minimax(self, board, depth, alpha, beta, ply, static_score=None):
+        self.nodes += 1
+        if self.nodes % CHECK_INTERVAL == 0:
+            self.check_limits()
+
+        if depth == 0:
+            moves = None
+            has_moves = board.has_legal_move()
+        else:
+            moves = board.legal_moves()
+            has_moves = bool(moves)
+        if not has_moves:
+            return -MATE_SCORE + ply if board.is_check() else 0
+        if board.halfmove_clock >= 150 or board.is_insufficient_material() or board.is_repetition(5):
+            return 0
+        if self.bitbases is not None and chess.popcount(board.occupied) == 3:
+            # Draws are exact; won positions are still searched below the horizon so mates get found.
+            result = self.bitbases.probe(board)
+            if result == DRAW or (result is not None and depth == 0):
+                return self.bitbase_score(board, result, ply)
+        if depth == 0:
+            self.leaf_nodes += 1
+            return self.evaluator.current(board) if static_score is None else static_score
 
-    def minimax(self, board, depth, alpha, beta):
-        if depth == 0 or board.is_game_over():
-            return self.evaluate_board(board)
+        key = board.hash
+        entry = self.tt.probe(key)
+        hash_move = entry.move if entry is not None else None
+        if entry is not None and entry.depth >= depth:
+            score = self.score_from_tt(entry.score, ply)
+            if entry.flag == EXACT:
+                return score
+            if entry.flag == LOWER_BOUND and score >= beta:
+                return score
+            if entry.flag == UPPER_BOUND and score <= alpha:
+                return score
 
+        alpha_orig = alpha
         max_eval = -math.inf
-        for move in board.legal_moves:
-            board.push(move)
-            eval = -self.minimax(board, depth - 1, -beta, -alpha)
-            board.pop()
-            max_eval = max(max_eval, eval)
+        best_move = None
+        moves = self.orderer.order(board, moves, ply, hash_move)
+        scores = self.evaluator.evaluate_moves(board, moves) if depth == 1 and self.batched else None
+        for index, move in enumerate(moves):
+            if scores is None:
+                self.evaluator.push(board, move)
+                board.make(move)
+                eval = -self.minimax(board, depth - 1, -beta, -alpha, ply + 1)
+                board.unmake()
+                self.evaluator.pop()
+            else:
+                board.make(move)
+                eval = -self.minimax(board, 0, -beta, -alpha, ply + 1, scores[index])
+                board.unmake()
+            if eval > max_eval:
+                max_eval = eval
+                best_move = move
             alpha = max(alpha, eval)
             if beta <= alpha:
+                self.beta_cutoffs += 1
+                if index == 0:
+                    self.first_move_cutoffs += 1
+                self.orderer.record_cutoff(board, move, ply, depth)
                 break
+
+        if max_eval <= alpha_orig:
+            flag = UPPER_BOUND
+        elif max_eval >= beta:
+            flag = LOWER_BOUND
+        else:
+            flag = EXACT
+        self.tt.store(key, depth, self.score_to_tt(max_eval, ply), flag, best_move)
         return max_eval
 
+    @staticmethod
+    def bitbase_score(board, result, ply):
+        if result == DRAW:
+            return 0
+        strong = board.turn if result == WIN else not board.turn
+        strong_king = board.king(strong)
+        weak_king = board.king(not strong)
+        # All won positions look alike to the bitbase, so reward progress: a cornered defending king,
+        # a close attacking king and an advanced pawn.
+        progress = 10 * CENTER_DISTANCE[weak_king] - 4 * chess.square_distance(strong_king, weak_king)
+        for pawn in chess.scan_forward(board.pieces_mask(chess.PAWN, strong)):
+            progress += 20 * (chess.square_rank(pawn) if strong == chess.WHITE else 7 - chess.square_rank(pawn))
+        score = BITBASE_WIN_SCORE + progress - ply
+        return score if result == WIN else -score
+
+    @staticmethod
+    def score_to_tt(score, ply):
+        # Mate scores are stored relative to the node so they stay valid on transposition.
+        if score >= MATE_THRESHOLD:
+            return score + ply
+        if score <= -MATE_THRESHOLD:
+            return score - ply
+        return score
+
+    @staticmethod
+    def score_from_tt(score, ply):
+        if score >= MATE_THRESHOLD:
+            return score - ply
+        if score <= -MATE_THRESHOLD:
+            return score + ply
+        return score
+
     def evaluate_board(self, board):
         if board.is_checkmate():
-            return -9999 if board.turn else 9999
-
-        score = 0
-        for square in chess.SQUARES:
-            piece = board.piece_at(square)
-            if piece:
-                value = self.piece_values.get(piece.piece_type, 0)
-                if piece.color == board.turn:
-                    score += value
-                else:
-                    score -= value
-        return score
+            return -MATE_SCORE
+        return self.evaluator.evaluate(board)
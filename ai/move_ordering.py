@@ -0,0 +1,61 @@
+import chess
+from ai.search_board import EN_PASSANT, FLAG_SHIFT, PROMOTION_SHIFT
+
+HASH_MOVE_SCORE = 1000000
+CAPTURE_SCORE = 100000
+PROMOTION_SCORE = 95000
+KILLER_SCORES = (90000, 80000)
+HISTORY_LIMIT = 50000
+MAX_PLY = 64
+
+
+class MoveOrderer:
+    # Orders the integer moves of a SearchBoard; history is indexed by from | to << 6.
+    def __init__(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = {chess.WHITE: [0] * 4096, chess.BLACK: [0] * 4096}
+
+    def clear(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        self.history = {chess.WHITE: [0] * 4096, chess.BLACK: [0] * 4096}
+
+    def new_search(self):
+        self.killers = [[None, None] for _ in range(MAX_PLY)]
+        for table in self.history.values():
+            for i in range(4096):
+                table[i] >>= 1
+
+    def order(self, board, moves, ply, hash_move=None):
+        squares = board.squares
+        killers = self.killers[ply] if ply < MAX_PLY else (None, None)
+        history = self.history[board.turn]
+
+        def score(move):
+            if move == hash_move:
+                return HASH_MOVE_SCORE
+            victim = squares[(move >> 6) & 63] & 7
+            if victim or move >> FLAG_SHIFT == EN_PASSANT:
+                return CAPTURE_SCORE + (victim or chess.PAWN) * 10 - (squares[move & 63] & 7)
+            promotion = (move >> PROMOTION_SHIFT) & 7
+            if promotion:
+                return PROMOTION_SCORE + promotion
+            if move == killers[0]:
+                return KILLER_SCORES[0]
+            if move == killers[1]:
+                return KILLER_SCORES[1]
+            return history[move & 4095]
+
+        # sorted() is stable, so moves with equal scores keep their incoming order.
+        return sorted(moves, key=score, reverse=True)
+
+    def record_cutoff(self, board, move, ply, depth):
+        if board.squares[(move >> 6) & 63] or move >> FLAG_SHIFT == EN_PASSANT or (move >> PROMOTION_SHIFT) & 7:
+            return
+        if ply < MAX_PLY:
+            killers = self.killers[ply]
+            if killers[0] != move:
+                killers[1] = killers[0]
+                killers[0] = move
+        table = self.history[board.turn]
+        index = move & 4095
+        table[index] = min(HISTORY_LIMIT, table[index] + depth * depth)
@@ -0,0 +1,122 @@
+import argparse
+import chess
+import chess.pgn
+import chess.polyglot
+import os
+import random
+import struct
+from collections import defaultdict
+from ai.strategy_interface import AIStrategy
+
+ENTRY_STRUCT = struct.Struct(">QHHI")
+MAX_WEIGHT = 0xFFFF
+
+
+class OpeningBook:
+    def __init__(self, path=None):
+        self.path = path
+        self.reader = None
+        if path is not None and os.path.exists(path):
+            # The reader memory-maps the file and binary-searches the sorted keys,
+            # so every process shares the same pages instead of loading its own copy.
+            self.reader = chess.polyglot.open_reader(path)
+
+    def is_loaded(self):
+        return self.reader is not None
+
+    def close(self):
+        if self.reader is not None:
+            self.reader.close()
+            self.reader = None
+
+    def entries(self, board):
+        if self.reader is None:
+            return []
+        return list(self.reader.find_all(board))
+
+    def probe(self, board):
+        if self.reader is None:
+            return None
+        try:
+            return self.reader.weighted_choice(board, random=random).move
+        except IndexError:
+            return None
+
+
+class BookStrategy(AIStrategy):
+    def __init__(self, strategy, book):
+        self.strategy = strategy
+        self.book = book
+        self.book_hits = 0
+
+    def probe(self, board):
+        move = self.book.probe(board)
+        if move is not None:
+            self.book_hits += 1
+        return move
+
+    def get_move(self, board, **kwargs):
+        move = self.probe(board)
+        if move is not None:
+            return move
+        return self.strategy.get_move(board, **kwargs)
+
+    def get_move_cancellable(self, board, stop_event, **kwargs):
+        move = self.probe(board)
+        if move is not None:
+            return move
+        return self.strategy.get_move_cancellable(board, stop_event, **kwargs)
+
+
+def encode_move(board, move):
+    # Polyglot writes castling as "king takes own rook" and promotions as knight=1 .. queen=4.
+    to_square = move.to_square
+    if board.is_castling(move):
+        rook_file = 7 if chess.square_file(move.to_square) > chess.square_file(move.from_square) else 0
+        to_square = chess.square(rook_file, chess.square_rank(move.from_square))
+    promotion = move.promotion - 1 if move.promotion else 0
+    return (chess.square_file(to_square) | chess.square_rank(to_square) << 3 |
+            chess.square_file(move.from_square) << 6 | chess.square_rank(move.from_square) << 9 |
+            promotion << 12)
+
+
+def build_book(pgn_paths, output_path, max_plies=24):
+    counts = defaultdict(int)
+    games = 0
+    for pgn_path in pgn_paths:
+        with open(pgn_path, encoding="utf-8", errors="replace") as handle:
+            while True:
+                game = chess.pgn.read_game(handle)
+                if game is None:
+                    break
+                games += 1
+                board = game.board()
+                for ply, move in enumerate(game.mainline_moves()):
+                    if ply >= max_plies:
+                        break
+                    counts[(chess.polyglot.zobrist_hash(board), encode_move(board, move))] += 1
+                    board.push(move)
+
+    entries = sorted(counts.items(), key=lambda item: (item[0][0], -item[1]))
+    scale = max(counts.values(), default=1) // MAX_WEIGHT + 1
+    if os.path.dirname(output_path):
+        os.makedirs(os.path.dirname(output_path), exist_ok=True)
+    with open(output_path, "wb") as f:
+        for (key, raw_move), count in entries:
+            f.write(ENTRY_STRUCT.pack(key, raw_move, max(1, count // scale), 0))
+    return games, len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build a Polyglot opening book from PGN files.")
+    parser.add_argument("pgn", nargs="+")
+    parser.add_argument("--output", default="assets/book.bin")
+    parser.add_argument("--plies", type=int, default=24)
+    args = parser.parse_args()
+
+    games, entries = build_book(args.pgn, args.output, args.plies)
+    print(f"Book written to {args.output}: {entries} entries from {games} games.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,153 @@
+import chess
+import math
+import multiprocessing
+import time
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from ai.search_board import SearchBoard, decode_move
+from ai.search_stats import principal_variation
+from ai.transposition import EXACT
+
+POLL_INTERVAL = 0.01
+# Search counters each worker reports back, summed into the bot's own.
+COUNTERS = ("nodes", "leaf_nodes", "beta_cutoffs", "first_move_cutoffs")
+
+_worker_bot = None
+_worker_stop = None
+_worker_generation = 0
+
+
+def _init_worker(options, stop_flag):
+    global _worker_bot, _worker_stop
+    from ai.minimax_bot import MinimaxBot
+    _worker_bot = MinimaxBot(**options)
+    _worker_stop = stop_flag
+
+
+def _worker_counters():
+    return [getattr(_worker_bot, name) for name in COUNTERS]
+
+
+def _search_moves(root_fen, stack_ucis, move_ucis, depth, time_limit, node_limit, generation):
+    global _worker_generation
+    from ai.minimax_bot import SearchAborted
+
+    # The parent bumps the generation when its tables are cleared; each worker catches up before searching.
+    if generation != _worker_generation:
+        _worker_bot.on_game_reset()
+        _worker_generation = generation
+
+    board = chess.Board(root_fen)
+    for uci in stack_ucis:
+        board.push(chess.Move.from_uci(uci))
+    search_board = SearchBoard(board)
+    moves = [search_board.encode_move(chess.Move.from_uci(uci)) for uci in move_ucis]
+
+    _worker_bot.prepare_search(time_limit, node_limit, _worker_stop)
+    _worker_bot.evaluator.begin(search_board)
+    try:
+        move, value = _worker_bot.search_root(search_board, moves, depth)
+    except SearchAborted:
+        return None, None, _worker_counters(), []
+    # The line is read from the worker's table, which the parent never sees.
+    move = decode_move(move)
+    board.push(move)
+    pv = [move.uci()] + principal_variation(_worker_bot.tt, board, depth - 1)
+    return move.uci(), value, _worker_counters(), pv
+
+
+class ParallelRootSearch:
+    def __init__(self, bot, workers):
+        self.bot = bot
+        self.workers = workers
+        self.pool = None
+        self.stop_flag = None
+        self.generation = 0
+
+    def start(self):
+        if self.pool is not None:
+            return
+        # Spawn keeps workers independent of the parent's pygame/SDL state and matches Windows.
+        context = multiprocessing.get_context("spawn")
+        self.stop_flag = context.Event()
+        options = {
+            "depth": self.bot.depth,
+            "tt_size_mb": self.bot.tt_size_mb,
+            "max_depth": self.bot.max_depth,
+            "evaluator": self.bot.evaluator_name,
+            "bitbase_dir": self.bot.bitbase_dir
+        }
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=context,
+                                        initializer=_init_worker, initargs=(options, self.stop_flag))
+
+    def clear(self):
+        self.generation += 1
+
+    def shutdown(self):
+        if self.pool is not None:
+            self.stop_flag.set()
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+
+    def search_root(self, board, legal_moves, depth):
+        # board is the chess.Board being searched and legal_moves are its SearchBoard moves.
+        from ai.minimax_bot import SearchAborted
+
+        self.start()
+        self.stop_flag.clear()
+        bot = self.bot
+        root_fen = board.root().fen()
+        stack_ucis = [move.uci() for move in board.move_stack]
+        move_ucis = [decode_move(move).uci() for move in legal_moves]
+
+        # Deal the ordered moves round-robin so every worker starts with a strong candidate.
+        chunks = [move_ucis[i::self.workers] for i in range(self.workers)]
+        time_limit = None
+        if bot.deadline is not None:
+            time_limit = max(0.0, bot.deadline - time.perf_counter())
+        node_limit = None
+        if bot.node_limit is not None:
+            node_limit = max(1, (bot.node_limit - bot.nodes) // self.workers)
+
+        pending = {
+            self.pool.submit(_search_moves, root_fen, stack_ucis, chunk, depth, time_limit, node_limit,
+                             self.generation)
+            for chunk in chunks if chunk
+        }
+        results = []
+        while pending:
+            done, pending = wait(pending, timeout=POLL_INTERVAL, return_when=FIRST_COMPLETED)
+            for future in done:
+                results.append(future.result())
+            # The deadline can be moved while we wait, e.g. when a ponder search is converted.
+            if bot.stop_event.is_set() or (bot.deadline is not None and time.perf_counter() >= bot.deadline):
+                self.stop_flag.set()
+
+        # Equal scores go to the earlier move in the ordering, as in the serial search.
+        order = {move_uci: index for index, move_uci in enumerate(move_ucis)}
+        best_uci = None
+        best_value = -math.inf
+        best_pv = []
+        aborted = False
+        for move_uci, value, counters, pv in results:
+            for name, count in zip(COUNTERS, counters):
+                setattr(bot, name, getattr(bot, name) + count)
+            if move_uci is None:
+                aborted = True
+            elif value > best_value or (value == best_value and order[move_uci] < order[best_uci]):
+                best_value = value
+                best_uci = move_uci
+                best_pv = pv
+
+        if aborted or bot.stop_event.is_set():
+            raise SearchAborted()
+        self.store_pv(board, best_pv, depth, best_value)
+        return legal_moves[order[best_uci]], best_value
+
+    def store_pv(self, board, pv, depth, value):
+        # The winning line goes into the bot's own table, where pondering and the stats PV look for it.
+        search_board = SearchBoard(board)
+        for ply, uci in enumerate(pv[:depth]):
+            move = search_board.encode_move(chess.Move.from_uci(uci))
+            score = value if ply % 2 == 0 else -value
+            self.bot.tt.store(search_board.hash, depth - ply, self.bot.score_to_tt(score, ply), EXACT, move)
+            search_board.make(move)
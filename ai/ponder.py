@@ -0,0 +1,76 @@
+import chess.polyglot
+import time
+from ai.search_board import decode_move
+from core.events import game_events
+from core.settings import AI_PONDER_MAX_TIME
+
+
+class Ponderer:
+    def __init__(self, bot):
+        self.bot = bot
+        self.request = None
+        self.predicted_move = None
+        self.hit = False
+        self.started = 0
+        self.hits = 0
+        self.misses = 0
+        game_events.subscribe("move_made", self.on_move_made)
+        game_events.subscribe("game_reset", self.on_game_reset)
+        game_events.subscribe("game_over", self.on_game_over)
+
+    def predict_reply(self, board):
+        entry = self.bot.tt.peek(chess.polyglot.zobrist_hash(board))
+        if entry is None or entry.move is None:
+            return None
+        move = decode_move(entry.move)
+        return move if move in board.legal_moves else None
+
+    def start(self, board):
+        self.stop()
+        predicted = self.predict_reply(board)
+        if predicted is None:
+            return
+        ponder_board = board.copy()
+        ponder_board.push(predicted)
+        if ponder_board.is_game_over():
+            return
+        self.predicted_move = predicted
+        self.started = time.perf_counter()
+        self.request = self.bot.request_move(ponder_board, time_limit=AI_PONDER_MAX_TIME)
+
+    def stop(self):
+        if self.request is not None:
+            self.request.cancel()
+        self.request = None
+        self.predicted_move = None
+        self.hit = False
+
+    def on_move_made(self, move):
+        if self.request is None or self.hit:
+            return
+        if move == self.predicted_move:
+            self.hit = True
+            self.hits += 1
+        else:
+            self.misses += 1
+            self.stop()
+
+    def on_game_reset(self, data=None):
+        self.stop()
+
+    def on_game_over(self, data=None):
+        # Also sent when a clock runs out, so a search for a game that has ended does not keep a core busy.
+        self.stop()
+
+    def take_hit(self, time_limit):
+        # Turn a successful ponder search into the real one; time already spent pondering counts
+        # towards the normal move budget.
+        if self.request is None or not self.hit:
+            return None
+        request = self.request
+        self.request = None
+        self.predicted_move = None
+        self.hit = False
+        if not request.done():
+            self.bot.set_time_limit(max(0.0, time_limit - (time.perf_counter() - self.started)))
+        return request
@@ -0,0 +1,536 @@
+import chess
+import chess.polyglot
+
+# Search-only board: a 64-square mailbox plus one bitboard per piece code, integer moves and
+# a preallocated undo stack. It converts from chess.Board at the root and back to chess.Move
+# for the result, and its hash is identical to chess.polyglot.zobrist_hash.
+
+# Piece codes: the chess piece type for White, piece type + 8 for Black, 0 for an empty square.
+BLACK_OFFSET = 8
+
+# Moves: from | to << 6 | promotion << 12 | flag << 15
+NORMAL = 0
+DOUBLE_PUSH = 1
+EN_PASSANT = 2
+CASTLING = 3
+FLAG_SHIFT = 15
+PROMOTION_SHIFT = 12
+
+MAX_STACK = 256
+
+WHITE_KINGSIDE = 1
+WHITE_QUEENSIDE = 2
+BLACK_KINGSIDE = 4
+BLACK_QUEENSIDE = 8
+
+BB = chess.BB_SQUARES
+PAWN_ATTACKS = [chess.BB_PAWN_ATTACKS[chess.BLACK], chess.BB_PAWN_ATTACKS[chess.WHITE]]
+KNIGHT_ATTACKS = chess.BB_KNIGHT_ATTACKS
+KING_ATTACKS = chess.BB_KING_ATTACKS
+BETWEEN = [[chess.between(a, b) for b in chess.SQUARES] for a in chess.SQUARES]
+LINES = [[chess.ray(a, b) for b in chess.SQUARES] for a in chess.SQUARES]
+
+ORTHOGONAL = [(0, 1), (0, -1), (1, 0), (-1, 0)]
+DIAGONAL = [(1, 1), (1, -1), (-1, 1), (-1, -1)]
+
+
+def _build_rays(directions):
+    # rays[square] = one list of (target, move) per direction, nearest square first.
+    table = []
+    for square in chess.SQUARES:
+        square_rays = []
+        for file_step, rank_step in directions:
+            ray = []
+            file, rank = chess.square_file(square) + file_step, chess.square_rank(square) + rank_step
+            while 0 <= file < 8 and 0 <= rank < 8:
+                target = chess.square(file, rank)
+                ray.append((target, square | target << 6))
+                file, rank = file + file_step, rank + rank_step
+            if ray:
+                square_rays.append(ray)
+        table.append(square_rays)
+    return table
+
+
+def _lines(rays):
+    lines = []
+    for square_rays in rays:
+        mask = 0
+        for ray in square_rays:
+            for target, _ in ray:
+                mask |= BB[target]
+        lines.append(mask)
+    return lines
+
+
+def _step_moves(attacks):
+    return [[(target, square | target << 6) for target in chess.scan_forward(attacks[square])]
+            for square in chess.SQUARES]
+
+
+ROOK_RAYS = _build_rays(ORTHOGONAL)
+BISHOP_RAYS = _build_rays(DIAGONAL)
+QUEEN_RAYS = [ROOK_RAYS[square] + BISHOP_RAYS[square] for square in chess.SQUARES]
+ROOK_LINES = _lines(ROOK_RAYS)
+BISHOP_LINES = _lines(BISHOP_RAYS)
+KNIGHT_MOVES = _step_moves(KNIGHT_ATTACKS)
+KING_MOVES = _step_moves(KING_ATTACKS)
+PAWN_CAPTURES = [_step_moves(PAWN_ATTACKS[0]), _step_moves(PAWN_ATTACKS[1])]
+
+# Castling: (right, king from, king to, squares that must be empty, squares that must not be attacked)
+CASTLES = [
+    [(BLACK_KINGSIDE, chess.E8, chess.G8, (chess.F8, chess.G8), (chess.E8, chess.F8)),
+     (BLACK_QUEENSIDE, chess.E8, chess.C8, (chess.D8, chess.C8, chess.B8), (chess.E8, chess.D8))],
+    [(WHITE_KINGSIDE, chess.E1, chess.G1, (chess.F1, chess.G1), (chess.E1, chess.F1)),
+     (WHITE_QUEENSIDE, chess.E1, chess.C1, (chess.D1, chess.C1, chess.B1), (chess.E1, chess.D1))]
+]
+CASTLING_ROOKS = {
+    chess.G1: (chess.H1, chess.F1), chess.C1: (chess.A1, chess.D1),
+    chess.G8: (chess.H8, chess.F8), chess.C8: (chess.A8, chess.D8)
+}
+CASTLING_MASKS = [15] * 64
+CASTLING_MASKS[chess.E1] = 15 & ~(WHITE_KINGSIDE | WHITE_QUEENSIDE)
+CASTLING_MASKS[chess.H1] = 15 & ~WHITE_KINGSIDE
+CASTLING_MASKS[chess.A1] = 15 & ~WHITE_QUEENSIDE
+CASTLING_MASKS[chess.E8] = 15 & ~(BLACK_KINGSIDE | BLACK_QUEENSIDE)
+CASTLING_MASKS[chess.H8] = 15 & ~BLACK_KINGSIDE
+CASTLING_MASKS[chess.A8] = 15 & ~BLACK_QUEENSIDE
+
+# Polyglot keys: piece index is 2 * (type - 1) + (1 for White), castling 768..771, en passant file 772..779.
+POLYGLOT = chess.polyglot.POLYGLOT_RANDOM_ARRAY
+PIECE_KEYS = [[0] * 64 for _ in range(16)]
+for _piece_type in chess.PIECE_TYPES:
+    for _square in chess.SQUARES:
+        PIECE_KEYS[_piece_type][_square] = POLYGLOT[64 * (2 * (_piece_type - 1) + 1) + _square]
+        PIECE_KEYS[_piece_type + BLACK_OFFSET][_square] = POLYGLOT[64 * (2 * (_piece_type - 1)) + _square]
+CASTLING_KEYS = [0] * 16
+for _rights in range(16):
+    for _bit in range(4):
+        if _rights & (1 << _bit):
+            CASTLING_KEYS[_rights] ^= POLYGLOT[768 + _bit]
+EP_KEYS = [POLYGLOT[772 + chess.square_file(square)] for square in chess.SQUARES]
+TURN_KEY = POLYGLOT[780]
+
+
+def piece_code(piece_type, color):
+    return piece_type if color == chess.WHITE else piece_type + BLACK_OFFSET
+
+
+def decode_move(move):
+    promotion = (move >> PROMOTION_SHIFT) & 7
+    return chess.Move(move & 63, (move >> 6) & 63, promotion or None)
+
+
+def _scan(mask):
+    while mask:
+        bit = mask & -mask
+        yield bit.bit_length() - 1
+        mask ^= bit
+
+
+class SearchBoard:
+    def __init__(self, board=None):
+        self.squares = [0] * 64
+        self.masks = [0] * 16
+        self.occupied_co = [0, 0]
+        self.occupied = 0
+        self.kings = [0, 0]
+        self.turn = chess.WHITE
+        self.castling = 0
+        self.ep_square = None
+        self.ep_key = 0
+        self.halfmove_clock = 0
+        self.hash = 0
+        self.ply = 0
+        self.undo = [None] * MAX_STACK
+        self.keys = [0] * MAX_STACK
+        self.key_base = 0
+        if board is not None:
+            self.set_board(board)
+
+    def set_board(self, board):
+        self.squares = [0] * 64
+        self.masks = [0] * 16
+        for square, piece in board.piece_map().items():
+            code = piece_code(piece.piece_type, piece.color)
+            self.squares[square] = code
+            self.masks[code] |= BB[square]
+        self.occupied_co = [board.occupied_co[chess.BLACK], board.occupied_co[chess.WHITE]]
+        self.occupied = board.occupied
+        self.kings = [board.king(chess.BLACK), board.king(chess.WHITE)]
+        self.turn = board.turn
+        self.castling = 0
+        for color, kingside, queenside in ((chess.WHITE, WHITE_KINGSIDE, WHITE_QUEENSIDE),
+                                           (chess.BLACK, BLACK_KINGSIDE, BLACK_QUEENSIDE)):
+            if board.has_kingside_castling_rights(color):
+                self.castling |= kingside
+            if board.has_queenside_castling_rights(color):
+                self.castling |= queenside
+        self.ep_square = board.ep_square
+        self.ep_key = self.en_passant_key(self.ep_square, self.turn)
+        self.halfmove_clock = board.halfmove_clock
+        self.hash = chess.polyglot.zobrist_hash(board)
+        self.ply = 0
+
+        # Keys of the reversible part of the game history, for repetition detection.
+        history = []
+        previous = board.copy()
+        for _ in range(min(board.halfmove_clock, len(board.move_stack))):
+            previous.pop()
+            history.append(chess.polyglot.zobrist_hash(previous))
+        history.reverse()
+        self.keys = history + [self.hash] + [0] * MAX_STACK
+        self.key_base = len(history)
+
+    def en_passant_key(self, ep_square, turn):
+        # Polyglot only hashes the en passant file when a pawn could actually capture.
+        if ep_square is None:
+            return 0
+        if PAWN_ATTACKS[not turn][ep_square] & self.masks[piece_code(chess.PAWN, turn)]:
+            return EP_KEYS[ep_square]
+        return 0
+
+    # chess.Board-compatible queries used by the evaluators and the bitbase probe.
+    def piece_type_at(self, square):
+        return self.squares[square] & 7 or None
+
+    def piece_at(self, square):
+        code = self.squares[square]
+        if not code:
+            return None
+        return chess.Piece(code & 7, code < BLACK_OFFSET)
+
+    def pieces_mask(self, piece_type, color):
+        return self.masks[piece_code(piece_type, color)]
+
+    def king(self, color):
+        return self.kings[color]
+
+    def encode_move(self, move):
+        piece_type = self.squares[move.from_square] & 7
+        flag = NORMAL
+        if piece_type == chess.PAWN:
+            if abs(move.to_square - move.from_square) == 16:
+                flag = DOUBLE_PUSH
+            elif move.to_square == self.ep_square and not self.squares[move.to_square]:
+                flag = EN_PASSANT
+        elif piece_type == chess.KING and abs(move.to_square - move.from_square) == 2:
+            flag = CASTLING
+        return (move.from_square | move.to_square << 6 | (move.promotion or 0) << PROMOTION_SHIFT |
+                flag << FLAG_SHIFT)
+
+    def is_attacked(self, square, by_color):
+        masks = self.masks
+        offset = 0 if by_color else BLACK_OFFSET
+        if KNIGHT_ATTACKS[square] & masks[chess.KNIGHT + offset]:
+            return True
+        if PAWN_ATTACKS[not by_color][square] & masks[chess.PAWN + offset]:
+            return True
+        if KING_ATTACKS[square] & masks[chess.KING + offset]:
+            return True
+        queens = masks[chess.QUEEN + offset]
+        sliders = (ROOK_LINES[square] & (masks[chess.ROOK + offset] | queens) |
+                   BISHOP_LINES[square] & (masks[chess.BISHOP + offset] | queens))
+        if sliders:
+            between = BETWEEN[square]
+            occupied = self.occupied
+            while sliders:
+                bit = sliders & -sliders
+                if not between[bit.bit_length() - 1] & occupied:
+                    return True
+                sliders ^= bit
+        return False
+
+    def is_check(self):
+        return self.is_attacked(self.kings[self.turn], not self.turn)
+
+    def pinned(self, color):
+        # Own pieces that are the only blocker between our king and an enemy slider.
+        masks = self.masks
+        king = self.kings[color]
+        offset = BLACK_OFFSET if color else 0
+        queens = masks[chess.QUEEN + offset]
+        snipers = (ROOK_LINES[king] & (masks[chess.ROOK + offset] | queens) |
+                   BISHOP_LINES[king] & (masks[chess.BISHOP + offset] | queens))
+        pinned = 0
+        own = self.occupied_co[color]
+        occupied = self.occupied
+        between = BETWEEN[king]
+        while snipers:
+            bit = snipers & -snipers
+            blockers = between[bit.bit_length() - 1] & occupied
+            if blockers and not blockers & (blockers - 1) and blockers & own:
+                pinned |= blockers
+            snipers ^= bit
+        return pinned
+
+    def pseudo_legal_moves(self):
+        return list(self.generate_moves())
+
+    def generate_moves(self):
+        # Lazy pseudo-legal generation, so has_legal_move can stop at the first legal move.
+        squares = self.squares
+        color = self.turn
+        own_offset = 0 if color else BLACK_OFFSET
+
+        for square in _scan(self.occupied_co[color]):
+            piece_type = squares[square] & 7
+            if piece_type == chess.PAWN:
+                forward = 8 if color else -8
+                target = square + forward
+                if not squares[target]:
+                    if target >> 3 in (0, 7):
+                        for promotion in (chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT):
+                            yield square | target << 6 | promotion << PROMOTION_SHIFT
+                    else:
+                        yield square | target << 6
+                        if square >> 3 == (1 if color else 6) and not squares[target + forward]:
+                            yield square | (target + forward) << 6 | DOUBLE_PUSH << FLAG_SHIFT
+                for target, move in PAWN_CAPTURES[color][square]:
+                    victim = squares[target]
+                    if victim and victim & BLACK_OFFSET != own_offset:
+                        if target >> 3 in (0, 7):
+                            for promotion in (chess.QUEEN, chess.ROOK, chess.BISHOP, chess.KNIGHT):
+                                yield move | promotion << PROMOTION_SHIFT
+                        else:
+                            yield move
+                    elif target == self.ep_square:
+                        yield move | EN_PASSANT << FLAG_SHIFT
+            elif piece_type == chess.KNIGHT or piece_type == chess.KING:
+                for target, move in (KNIGHT_MOVES if piece_type == chess.KNIGHT else KING_MOVES)[square]:
+                    victim = squares[target]
+                    if not victim or victim & BLACK_OFFSET != own_offset:
+                        yield move
+            else:
+                rays = ROOK_RAYS if piece_type == chess.ROOK else BISHOP_RAYS if piece_type == chess.BISHOP \
+                    else QUEEN_RAYS
+                for ray in rays[square]:
+                    for target, move in ray:
+                        victim = squares[target]
+                        if not victim:
+                            yield move
+                            continue
+                        if victim & BLACK_OFFSET != own_offset:
+                            yield move
+                        break
+
+        if self.castling:
+            for right, king_from, king_to, empty, safe in CASTLES[color]:
+                if self.castling & right and not any(squares[sq] for sq in empty) \
+                        and not any(self.is_attacked(sq, not color) for sq in safe):
+                    yield king_from | king_to << 6 | CASTLING << FLAG_SHIFT
+
+    def is_legal(self, move):
+        color = self.turn
+        self.make(move)
+        legal = not self.is_attacked(self.kings[color], not color)
+        self.unmake()
+        return legal
+
+    def is_safe(self, move, king, pinned):
+        # Legality of a pseudo-legal move when the side to move is not in check. Only en passant,
+        # which can uncover a rank attack on the king, still needs a make/unmake test.
+        from_square = move & 63
+        if from_square == king:
+            return not self.is_attacked((move >> 6) & 63, not self.turn)
+        if move >> FLAG_SHIFT == EN_PASSANT:
+            return self.is_legal(move)
+        if BB[from_square] & pinned:
+            return bool(LINES[king][from_square] & BB[(move >> 6) & 63])
+        return True
+
+    def legal_moves(self):
+        color = self.turn
+        king = self.kings[color]
+        moves = self.pseudo_legal_moves()
+        if self.is_attacked(king, not color):
+            return [move for move in moves if self.is_legal(move)]
+        pinned = self.pinned(color)
+        legal = []
+        for move in moves:
+            from_square = move & 63
+            if from_square == king or BB[from_square] & pinned or move >> FLAG_SHIFT == EN_PASSANT:
+                if not self.is_safe(move, king, pinned):
+                    continue
+            legal.append(move)
+        return legal
+
+    def has_legal_move(self):
+        color = self.turn
+        king = self.kings[color]
+        if self.is_attacked(king, not color):
+            return any(self.is_legal(move) for move in self.generate_moves())
+        pinned = self.pinned(color)
+        return any(self.is_safe(move, king, pinned) for move in self.generate_moves())
+
+    def is_insufficient_material(self):
+        masks = self.masks
+        if masks[chess.PAWN] | masks[chess.ROOK] | masks[chess.QUEEN] or \
+                masks[chess.PAWN + BLACK_OFFSET] | masks[chess.ROOK + BLACK_OFFSET] | \
+                masks[chess.QUEEN + BLACK_OFFSET]:
+            return False
+        return self.has_insufficient_material(chess.WHITE) and self.has_insufficient_material(chess.BLACK)
+
+    def has_insufficient_material(self, color):
+        # Same rules as chess.Board.has_insufficient_material.
+        masks = self.masks
+        own = self.occupied_co[color]
+        offset = 0 if color else BLACK_OFFSET
+        enemy_offset = BLACK_OFFSET - offset
+        if masks[chess.PAWN + offset] | masks[chess.ROOK + offset] | masks[chess.QUEEN + offset]:
+            return False
+        if masks[chess.KNIGHT + offset]:
+            return chess.popcount(own) <= 2 and not (self.occupied_co[not color] & ~masks[chess.KING + enemy_offset]
+                                                     & ~masks[chess.QUEEN + enemy_offset])
+        if masks[chess.BISHOP + offset]:
+            bishops = masks[chess.BISHOP] | masks[chess.BISHOP + BLACK_OFFSET]
+            same_color = not bishops & chess.BB_DARK_SQUARES or not bishops & chess.BB_LIGHT_SQUARES
+            return same_color and not (masks[chess.PAWN] | masks[chess.PAWN + BLACK_OFFSET]) \
+                and not (masks[chess.KNIGHT] | masks[chess.KNIGHT + BLACK_OFFSET])
+        return True
+
+    def is_repetition(self, count):
+        if self.halfmove_clock < 4 * (count - 1):
+            return False
+        keys = self.keys
+        index = self.key_base + self.ply
+        key = keys[index]
+        seen = 1
+        for previous in range(index - 2, max(-1, index - self.halfmove_clock - 1), -2):
+            if keys[previous] == key:
+                seen += 1
+                if seen >= count:
+                    return True
+        return False
+
+    def make(self, move):
+        squares = self.squares
+        masks = self.masks
+        occupied_co = self.occupied_co
+        color = self.turn
+        from_square = move & 63
+        to_square = (move >> 6) & 63
+        flag = move >> FLAG_SHIFT
+        piece = squares[from_square]
+        captured = squares[to_square]
+        key = self.hash ^ self.ep_key ^ TURN_KEY
+
+        self.undo[self.ply] = (move, captured, self.castling, self.ep_square, self.ep_key, self.halfmove_clock,
+                               self.hash)
+        self.ply += 1
+
+        from_bit = BB[from_square]
+        to_bit = BB[to_square]
+        promotion = (move >> PROMOTION_SHIFT) & 7
+        placed = promotion + (piece & BLACK_OFFSET) if promotion else piece
+
+        squares[from_square] = 0
+        squares[to_square] = placed
+        masks[piece] ^= from_bit
+        masks[placed] ^= to_bit
+        occupied_co[color] ^= from_bit | to_bit
+        key ^= PIECE_KEYS[piece][from_square] ^ PIECE_KEYS[placed][to_square]
+        if captured:
+            masks[captured] ^= to_bit
+            occupied_co[not color] ^= to_bit
+            key ^= PIECE_KEYS[captured][to_square]
+
+        self.ep_square = None
+        self.ep_key = 0
+        if flag:
+            if flag == DOUBLE_PUSH:
+                self.ep_square = (from_square + to_square) >> 1
+                self.ep_key = self.en_passant_key(self.ep_square, not color)
+                key ^= self.ep_key
+            elif flag == EN_PASSANT:
+                victim_square = to_square - 8 if color else to_square + 8
+                victim = squares[victim_square]
+                squares[victim_square] = 0
+                masks[victim] ^= BB[victim_square]
+                occupied_co[not color] ^= BB[victim_square]
+                key ^= PIECE_KEYS[victim][victim_square]
+            else:
+                rook_from, rook_to = CASTLING_ROOKS[to_square]
+                rook = squares[rook_from]
+                squares[rook_from] = 0
+                squares[rook_to] = rook
+                rook_bits = BB[rook_from] | BB[rook_to]
+                masks[rook] ^= rook_bits
+                occupied_co[color] ^= rook_bits
+                key ^= PIECE_KEYS[rook][rook_from] ^ PIECE_KEYS[rook][rook_to]
+
+        if piece & 7 == chess.KING:
+            self.kings[color] = to_square
+        castling = self.castling & CASTLING_MASKS[from_square] & CASTLING_MASKS[to_square]
+        if castling != self.castling:
+            key ^= CASTLING_KEYS[self.castling] ^ CASTLING_KEYS[castling]
+            self.castling = castling
+
+        self.halfmove_clock = 0 if captured or piece & 7 == chess.PAWN else self.halfmove_clock + 1
+        self.occupied = occupied_co[0] | occupied_co[1]
+        self.turn = not color
+        self.hash = key
+        self.keys[self.key_base + self.ply] = key
+
+    def unmake(self):
+        self.ply -= 1
+        move, captured, self.castling, self.ep_square, self.ep_key, self.halfmove_clock, self.hash = \
+            self.undo[self.ply]
+        squares = self.squares
+        masks = self.masks
+        occupied_co = self.occupied_co
+        color = not self.turn
+        self.turn = color
+        from_square = move & 63
+        to_square = (move >> 6) & 63
+        flag = move >> FLAG_SHIFT
+
+        from_bit = BB[from_square]
+        to_bit = BB[to_square]
+        placed = squares[to_square]
+        piece = chess.PAWN + (placed & BLACK_OFFSET) if (move >> PROMOTION_SHIFT) & 7 else placed
+
+        squares[from_square] = piece
+        squares[to_square] = captured
+        masks[placed] ^= to_bit
+        masks[piece] ^= from_bit
+        occupied_co[color] ^= from_bit | to_bit
+        if captured:
+            masks[captured] ^= to_bit
+            occupied_co[not color] ^= to_bit
+
+        if flag == EN_PASSANT:
+            victim_square = to_square - 8 if color else to_square + 8
+            victim = piece_code(chess.PAWN, not color)
+            squares[victim_square] = victim
+            masks[victim] ^= BB[victim_square]
+            occupied_co[not color] ^= BB[victim_square]
+        elif flag == CASTLING:
+            rook_from, rook_to = CASTLING_ROOKS[to_square]
+            rook = squares[rook_to]
+            squares[rook_to] = 0
+            squares[rook_from] = rook
+            rook_bits = BB[rook_from] | BB[rook_to]
+            masks[rook] ^= rook_bits
+            occupied_co[color] ^= rook_bits
+
+        if piece & 7 == chess.KING:
+            self.kings[color] = from_square
+        self.occupied = occupied_co[0] | occupied_co[1]
+
+    def advance(self, move):
+        # Forward-only replay of whole games (e.g. indexing an archive): the move is never unmade, so the undo
+        # slot is reused and games of any length fit in the fixed-size stack.
+        self.make(move)
+        self.ply = 0
+
+    def perft(self, depth):
+        moves = self.legal_moves()
+        if depth == 1:
+            return len(moves)
+        total = 0
+        for move in moves:
+            self.make(move)
+            total += self.perft(depth - 1)
+            self.unmake()
+        return total
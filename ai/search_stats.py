@@ -0,0 +1,60 @@
+import chess.polyglot
+import json
+import threading
+import time
+from ai.search_board import decode_move
+
+
+def principal_variation(tt, board, max_length):
+    # Follow the best moves stored in the transposition table from the root position.
+    pv = []
+    board = board.copy(stack=False)
+    seen = set()
+    while len(pv) < max_length:
+        key = chess.polyglot.zobrist_hash(board)
+        entry = tt.peek(key)
+        if key in seen or entry is None or entry.move is None:
+            break
+        move = decode_move(entry.move)
+        if move not in board.legal_moves:
+            break
+        seen.add(key)
+        pv.append(move.uci())
+        board.push(move)
+    return pv
+
+
+def build_search_stats(bot, board, move, iterations, elapsed, tt_probes, tt_hits):
+    probes = bot.tt.probes - tt_probes
+    hits = bot.tt.hits - tt_hits
+    return {
+        "timestamp": time.time(),
+        "fen": board.fen(),
+        "move": move.uci() if move is not None else None,
+        "score": bot.best_value,
+        "depth": bot.completed_depth,
+        "nodes": bot.nodes,
+        # There is no quiescence stage yet, so these are the horizon nodes that were statically evaluated.
+        "qnodes": bot.leaf_nodes,
+        "time": elapsed,
+        "nps": bot.nodes / elapsed if elapsed > 0 else 0.0,
+        "beta_cutoffs": bot.beta_cutoffs,
+        "first_move_cutoff_rate": bot.first_move_cutoffs / bot.beta_cutoffs if bot.beta_cutoffs else 0.0,
+        "tt_probes": probes,
+        "tt_hits": hits,
+        "tt_hit_rate": hits / probes if probes else 0.0,
+        "tt_fill": bot.tt.fill(),
+        "iterations": iterations,
+        "pv": principal_variation(bot.tt, board, max(1, bot.completed_depth))
+    }
+
+
+class SearchStatsLog:
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+
+    def append(self, stats):
+        with self.lock:
+            with open(self.path, "a") as f:
+                f.write(json.dumps(stats) + "\n")
@@ -1,6 +1,45 @@
+import threading
 from abc import ABC, abstractmethod
+from concurrent.futures import ThreadPoolExecutor
+
+_executor = None
+
+
+def _get_executor():
+    global _executor
+    if _executor is None:
+        _executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ai-search")
+    return _executor
+
+
+class MoveRequest:
+    def __init__(self, future, stop_event):
+        self.future = future
+        self.stop_event = stop_event
+
+    def done(self):
+        return self.future.done()
+
+    def cancelled(self):
+        return self.stop_event.is_set()
+
+    def result(self):
+        return self.future.result()
+
+    def cancel(self):
+        self.stop_event.set()
+        self.future.cancel()
+
 
 class AIStrategy(ABC):
     @abstractmethod
     def get_move(self, board):
-        pass
\ No newline at end of file
+        pass
+
+    def get_move_cancellable(self, board, stop_event, **kwargs):
+        return self.get_move(board, **kwargs)
+
+    def request_move(self, board, **kwargs):
+        stop_event = threading.Event()
+        future = _get_executor().submit(self.get_move_cancellable, board.copy(), stop_event, **kwargs)
+        return MoveRequest(future, stop_event)
@@ -0,0 +1,228 @@
+import argparse
+import chess
+import csv
+import json
+import math
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from ai.minimax_bot import MinimaxBot
+from ai.random_bot import RandomBot
+from core.game_state import GameState
+
+MAX_PLIES = 300
+STRATEGIES = {
+    "random": RandomBot,
+    "minimax": MinimaxBot
+}
+
+
+def parse_value(value):
+    for cast in (int, float):
+        try:
+            return cast(value)
+        except ValueError:
+            pass
+    return value
+
+
+def parse_spec(spec):
+    # "minimax:depth=2,movetime=0.1" -> ("minimax", {"depth": 2, "movetime": 0.1})
+    name, _, option_text = spec.partition(":")
+    options = {}
+    for item in filter(None, option_text.split(",")):
+        key, _, value = item.partition("=")
+        options[key.strip()] = parse_value(value.strip())
+    if name not in STRATEGIES:
+        raise ValueError(f"Unknown strategy '{name}'. Choose from: {', '.join(STRATEGIES)}")
+    return name, options
+
+
+class Player:
+    def __init__(self, spec):
+        self.spec = spec
+        name, options = parse_spec(spec)
+        self.movetime = options.pop("movetime", None)
+        # An explicit depth means fixed-depth search; otherwise budget from movetime or the clock.
+        self.timed = name == "minimax" and (self.movetime is not None or "depth" not in options)
+        self.strategy = STRATEGIES[name](**options)
+
+    def choose_move(self, board, remaining):
+        if not self.timed:
+            return self.strategy.get_move(board)
+        budget = self.movetime if self.movetime is not None else MinimaxBot.budget_from_clock(remaining)
+        return self.strategy.get_move(board, time_limit=min(budget, remaining))
+
+    def last_nodes(self):
+        return getattr(self.strategy, "nodes", 0)
+
+
+def play_game(game_index, white_spec, black_spec, a_is_white, random_plies, seed):
+    random.seed(seed)
+    players = {chess.WHITE: Player(white_spec), chess.BLACK: Player(black_spec)}
+    board = chess.Board()
+    for _ in range(random_plies):
+        moves = list(board.legal_moves)
+        if not moves:
+            break
+        board.push(random.choice(moves))
+
+    # Same per-move clock as GameState: the mover's clock restarts after every move,
+    # and is charged with the measured search time rather than real waiting.
+    clocks = {chess.WHITE: GameState.DEFAULT_TIME, chess.BLACK: GameState.DEFAULT_TIME}
+    stats = {color: {"moves": 0, "time": 0.0, "nodes": 0} for color in chess.COLORS}
+    result = None
+    termination = None
+
+    while result is None:
+        if board.is_game_over():
+            result = board.result()
+            termination = board.outcome().termination.name.lower()
+            break
+        if len(board.move_stack) >= MAX_PLIES:
+            result, termination = "1/2-1/2", "max_plies"
+            break
+
+        color = board.turn
+        start = time.perf_counter()
+        move = players[color].choose_move(board, clocks[color])
+        elapsed = time.perf_counter() - start
+
+        stats[color]["moves"] += 1
+        stats[color]["time"] += elapsed
+        stats[color]["nodes"] += players[color].last_nodes()
+
+        clocks[color] -= elapsed
+        if clocks[color] <= 0 or move is None:
+            result = "0-1" if color == chess.WHITE else "1-0"
+            termination = "time_forfeit"
+            break
+        board.push(move)
+        clocks[color] = GameState.DEFAULT_TIME
+
+    return {
+        "game": game_index,
+        "white": white_spec,
+        "black": black_spec,
+        "a_is_white": a_is_white,
+        "result": result,
+        "termination": termination,
+        "plies": len(board.move_stack),
+        "white_moves": stats[chess.WHITE]["moves"],
+        "white_time": stats[chess.WHITE]["time"],
+        "white_nodes": stats[chess.WHITE]["nodes"],
+        "black_moves": stats[chess.BLACK]["moves"],
+        "black_time": stats[chess.BLACK]["time"],
+        "black_nodes": stats[chess.BLACK]["nodes"]
+    }
+
+
+def elo_difference(score):
+    if score <= 0:
+        return -math.inf
+    if score >= 1:
+        return math.inf
+    return -400 * math.log10(1 / score - 1)
+
+
+def summarise(games, player_a, player_b):
+    points = 0.0
+    wins = draws = losses = 0
+    totals = {"a": {"moves": 0, "time": 0.0, "nodes": 0}, "b": {"moves": 0, "time": 0.0, "nodes": 0}}
+
+    for game in games:
+        a_side, b_side = ("white", "black") if game["a_is_white"] else ("black", "white")
+        if game["result"] == "1/2-1/2":
+            draws += 1
+            points += 0.5
+        elif (game["result"] == "1-0") == game["a_is_white"]:
+            wins += 1
+            points += 1
+        else:
+            losses += 1
+
+        for key, side in (("a", a_side), ("b", b_side)):
+            totals[key]["moves"] += game[f"{side}_moves"]
+            totals[key]["time"] += game[f"{side}_time"]
+            totals[key]["nodes"] += game[f"{side}_nodes"]
+
+    players = {}
+    for key, spec in (("a", player_a), ("b", player_b)):
+        total = totals[key]
+        players[key] = {
+            "spec": spec,
+            "moves": total["moves"],
+            "avg_move_latency": total["time"] / total["moves"] if total["moves"] else 0.0,
+            "nodes_per_second": total["nodes"] / total["time"] if total["time"] else 0.0
+        }
+
+    score = points / len(games) if games else 0.0
+    elo = elo_difference(score)
+    return {
+        "player_a": player_a,
+        "player_b": player_b,
+        "games": len(games),
+        "wins": wins,
+        "draws": draws,
+        "losses": losses,
+        "score": score,
+        "elo_difference": elo if math.isfinite(elo) else None,
+        "players": players
+    }
+
+
+def run_tournament(player_a, player_b, games, workers, random_plies=2, seed=0):
+    # Colours alternate so both players get the same number of games with White.
+    tasks = []
+    for index in range(games):
+        a_is_white = index % 2 == 0
+        white, black = (player_a, player_b) if a_is_white else (player_b, player_a)
+        tasks.append((index, white, black, a_is_white, random_plies, seed + index // 2))
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [pool.submit(play_game, *task) for task in tasks]
+        results = [future.result() for future in futures]
+    return results, summarise(results, player_a, player_b)
+
+
+def write_reports(results, summary, json_path=None, csv_path=None):
+    if json_path:
+        with open(json_path, "w") as f:
+            json.dump({"summary": summary, "games": results}, f, indent=4)
+    if csv_path:
+        with open(csv_path, "w", newline="") as f:
+            writer = csv.DictWriter(f, fieldnames=list(results[0].keys()))
+            writer.writeheader()
+            writer.writerows(results)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play headless games between two AI strategies.")
+    parser.add_argument("player_a", help="e.g. minimax:depth=3 or minimax:movetime=0.2")
+    parser.add_argument("player_b", help="e.g. random")
+    parser.add_argument("--games", type=int, default=10)
+    parser.add_argument("--workers", type=int, default=multiprocessing.cpu_count())
+    parser.add_argument("--random-plies", type=int, default=2, help="random opening plies for game variety")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--json", dest="json_path", default="tournament.json")
+    parser.add_argument("--csv", dest="csv_path", default=None)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results, summary = run_tournament(args.player_a, args.player_b, args.games, args.workers,
+                                      args.random_plies, args.seed)
+    write_reports(results, summary, args.json_path, args.csv_path)
+
+    elo = summary["elo_difference"]
+    print(f"{summary['player_a']} vs {summary['player_b']}: +{summary['wins']} ={summary['draws']} "
+          f"-{summary['losses']} (score {summary['score']:.3f}, "
+          f"Elo {'n/a' if elo is None else f'{elo:+.0f}'}) in {time.perf_counter() - start:.1f}s")
+    for player in summary["players"].values():
+        print(f"  {player['spec']}: {player['avg_move_latency'] * 1000:.1f} ms/move, "
+              f"{player['nodes_per_second']:.0f} nodes/s")
+
+
+if __name__ == "__main__":
+    main()
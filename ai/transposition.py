@@ -0,0 +1,91 @@
+from collections import namedtuple
+
+EXACT = 0
+LOWER_BOUND = 1
+UPPER_BOUND = 2
+
+# Rough per-entry footprint in CPython (slot pointer, entry tuple, boxed ints, move object).
+ENTRY_BYTES = 200
+
+TTEntry = namedtuple("TTEntry", ["key", "depth", "score", "flag", "move", "generation"])
+
+
+class TranspositionTable:
+    def __init__(self, size_mb=16):
+        self.size_mb = size_mb
+        capacity = max(1, int(size_mb * 1024 * 1024) // ENTRY_BYTES)
+        # Power of two so the slot index is a mask of the low hash bits.
+        self.capacity = 1 << (capacity.bit_length() - 1)
+        self.mask = self.capacity - 1
+        self.slots = [None] * self.capacity
+        self.generation = 0
+        self.used = 0
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def clear(self):
+        self.slots = [None] * self.capacity
+        self.generation = 0
+        self.used = 0
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.probes = 0
+        self.hits = 0
+        self.stores = 0
+        self.replacements = 0
+
+    def new_search(self):
+        self.generation += 1
+
+    def probe(self, key):
+        self.probes += 1
+        entry = self.slots[key & self.mask]
+        if entry is not None and entry.key == key:
+            self.hits += 1
+            return entry
+        return None
+
+    def peek(self, key):
+        # probe() without counting towards the hit statistics, for reading the table outside a search.
+        entry = self.slots[key & self.mask]
+        return entry if entry is not None and entry.key == key else None
+
+    def store(self, key, depth, score, flag, move):
+        index = key & self.mask
+        old = self.slots[index]
+        if old is None:
+            self.used += 1
+        elif old.key != key and old.generation == self.generation and old.depth > depth:
+            # Depth-preferred: keep the deeper result from the current search.
+            return
+        elif old.key != key:
+            self.replacements += 1
+        elif move is None:
+            move = old.move
+
+        self.slots[index] = TTEntry(key, depth, score, flag, move, self.generation)
+        self.stores += 1
+
+    def hit_rate(self):
+        if self.probes == 0:
+            return 0.0
+        return self.hits / self.probes
+
+    def fill(self):
+        return self.used / self.capacity
+
+    def stats(self):
+        return {
+            "size_mb": self.size_mb,
+            "capacity": self.capacity,
+            "used": self.used,
+            "fill": self.fill(),
+            "probes": self.probes,
+            "hits": self.hits,
+            "hit_rate": self.hit_rate(),
+            "stores": self.stores,
+            "replacements": self.replacements
+        }
@@ -0,0 +1,69 @@
+import argparse
+import chess
+import os
+import random
+import tempfile
+import time
+
+from storage.archive import GameArchive, convert_pgn
+from storage.pgn_stream import GameRecord, read_games, write_games
+
+MAX_PLIES = 160
+
+
+def random_games(count, seed=0):
+    # Seeded random playouts with a full tag roster, as a stand-in for a real game collection.
+    rng = random.Random(seed)
+    for game_id in range(count):
+        board = chess.Board()
+        moves = []
+        while len(moves) < MAX_PLIES and not board.is_game_over():
+            move = rng.choice(list(board.legal_moves))
+            board.push(move)
+            moves.append(move)
+        headers = {"Event": "Benchmark", "Site": "Local", "Date": "2024.01.01", "Round": str(game_id + 1),
+                   "White": f"Player {rng.randrange(500)}", "Black": f"Player {rng.randrange(500)}",
+                   "Result": board.result()}
+        yield GameRecord(headers, moves)
+
+
+def timed(run):
+    start = time.perf_counter()
+    value = run()
+    return value, time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the binary game archive with plain PGN.")
+    parser.add_argument("--games", type=int, default=2000)
+    parser.add_argument("--lookups", type=int, default=1000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        pgn_path = os.path.join(directory, "games.pgn")
+        archive_path = os.path.join(directory, "games.cga")
+        write_games(pgn_path, random_games(args.games))
+
+        _, pgn_read = timed(lambda: sum(1 for _ in read_games(pgn_path)))
+        (games, moves, _), convert = timed(lambda: convert_pgn(pgn_path, archive_path))
+        with GameArchive(archive_path) as archive:
+            _, archive_read = timed(lambda: sum(1 for _ in archive))
+            rng = random.Random(1)
+            ids = [rng.randrange(len(archive)) for _ in range(args.lookups)]
+            _, lookups = timed(lambda: [archive.read(game_id) for game_id in ids])
+            archive_size = archive.size()
+            _, export = timed(lambda: write_games(os.path.join(directory, "export.pgn"), archive))
+        pgn_size = os.path.getsize(pgn_path)
+
+    print(f"{games} games, {moves} moves")
+    print(f"{'size':<24} PGN {pgn_size:>10} bytes   archive {archive_size:>10} bytes "
+          f"({archive_size / pgn_size:.1%}, {archive_size / moves:.2f} bytes/move)")
+    print(f"{'read all games':<24} PGN {pgn_read:>10.2f} s       archive {archive_read:>10.2f} s "
+          f"({pgn_read / archive_read:.1f}x faster)")
+    print(f"{'convert PGN -> archive':<24} {convert:.2f} s ({games / convert:.0f} games/s)")
+    print(f"{'export archive -> PGN':<24} {export:.2f} s ({games / export:.0f} games/s)")
+    print(f"{'random access':<24} {lookups / args.lookups * 1e6:.0f} us per game")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+import argparse
+import chess
+import time
+
+from ai.minimax_bot import MinimaxBot
+from benchmarks.positions import SEARCH_POSITIONS
+
+
+def run_positions(bot, depth):
+    bot.depth = depth
+    results = {}
+    start = time.perf_counter()
+    for name, fen in SEARCH_POSITIONS.items():
+        # Also clears the worker processes' tables, so no position starts from a warm table.
+        bot.on_game_reset()
+        move = bot.get_move(chess.Board(fen))
+        results[name] = (move, bot.best_value, bot.nodes)
+    return time.perf_counter() - start, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure MinimaxBot root-split speed-up per worker count.")
+    parser.add_argument("--depth", type=int, default=4)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8])
+    args = parser.parse_args()
+
+    baseline_time = None
+    baseline_results = None
+    print(f"{'workers':>7} {'time (s)':>9} {'speed-up':>9} {'nodes':>9} {'same score':>10}")
+    for workers in args.workers:
+        bot = MinimaxBot(depth=args.depth, workers=workers)
+        # Warm-up pass so process start-up is not counted.
+        if bot.parallel is not None:
+            run_positions(bot, 1)
+        elapsed, results = run_positions(bot, args.depth)
+        bot.shutdown()
+
+        if baseline_time is None:
+            baseline_time, baseline_results = elapsed, results
+        nodes = sum(result[2] for result in results.values())
+        same = sum(1 for name, result in results.items() if result[1] == baseline_results[name][1])
+        print(f"{workers:>7} {elapsed:>9.2f} {baseline_time / elapsed:>8.2f}x {nodes:>9} "
+              f"{same:>4}/{len(results)}")
+
+
+if __name__ == "__main__":
+    main()
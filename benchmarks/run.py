@@ -0,0 +1,133 @@
+import argparse
+import chess
+import json
+import os
+import random
+import sys
+import time
+
+from ai.evaluation import EVALUATORS
+from ai.minimax_bot import MinimaxBot
+from benchmarks.perft import PERFT_POSITIONS, perft, search_board_perft
+from benchmarks.positions import SEARCH_POSITIONS
+
+BASELINE_FILE = os.path.join(os.path.dirname(__file__), "baseline.json")
+DEFAULT_THRESHOLD = 0.2
+SEARCH_DEPTH = 3
+EVAL_ROUNDS = 2000
+REPEATS = 3
+
+
+def measure(run, repeats=REPEATS):
+    # Best of several runs, to keep scheduler noise out of the comparison.
+    best_time = None
+    nodes = 0
+    for _ in range(repeats):
+        start = time.perf_counter()
+        nodes = run()
+        elapsed = time.perf_counter() - start
+        if best_time is None or elapsed < best_time:
+            best_time = elapsed
+    return nodes, best_time
+
+
+def bench_perft():
+    results = {}
+    for name, fen, depth, expected in PERFT_POSITIONS:
+        board = chess.Board(fen)
+        for prefix, count in (("perft", perft), ("searchboard", search_board_perft)):
+            nodes, elapsed = measure(lambda: count(board, depth))
+            results[f"{prefix}/{name}"] = {"nodes": nodes, "time": elapsed, "rate": nodes / elapsed,
+                                           "ok": nodes == expected}
+    return results
+
+
+def bench_search():
+    results = {}
+    for evaluator in EVALUATORS:
+        bot = MinimaxBot(depth=SEARCH_DEPTH, evaluator=evaluator, bitbase_dir=None)
+
+        def run():
+            random.seed(0)
+            nodes = 0
+            for fen in SEARCH_POSITIONS.values():
+                bot.on_game_reset()
+                bot.get_move(chess.Board(fen))
+                nodes += bot.nodes
+            return nodes
+
+        nodes, elapsed = measure(run)
+        results[f"search/{evaluator}"] = {"nodes": nodes, "time": elapsed, "rate": nodes / elapsed, "ok": True}
+    return results
+
+
+def bench_eval():
+    results = {}
+    boards = [chess.Board(fen) for fen in SEARCH_POSITIONS.values()]
+    for name, evaluator_class in EVALUATORS.items():
+        evaluator = evaluator_class()
+
+        def run():
+            for _ in range(EVAL_ROUNDS):
+                for board in boards:
+                    evaluator.evaluate(board)
+            return EVAL_ROUNDS * len(boards)
+
+        calls, elapsed = measure(run)
+        results[f"eval/{name}"] = {"nodes": calls, "time": elapsed, "rate": calls / elapsed, "ok": True}
+    return results
+
+
+def run_all():
+    results = {}
+    results.update(bench_perft())
+    results.update(bench_search())
+    results.update(bench_eval())
+    return results
+
+
+def compare(results, baseline, threshold):
+    failures = []
+    print(f"{'benchmark':<22} {'time (s)':>9} {'rate/s':>12} {'baseline':>12} {'change':>8}")
+    for name, result in results.items():
+        base = baseline.get(name)
+        change = ""
+        if base is not None:
+            ratio = result["rate"] / base["rate"]
+            change = f"{(ratio - 1) * 100:+.1f}%"
+            if ratio < 1 - threshold:
+                failures.append(f"{name}: throughput dropped {(1 - ratio) * 100:.1f}%")
+        if not result["ok"]:
+            failures.append(f"{name}: wrong node count {result['nodes']}")
+        base_rate = f"{base['rate']:.0f}" if base is not None else "-"
+        print(f"{name:<22} {result['time']:>9.3f} {result['rate']:>12.0f} {base_rate:>12} {change:>8}")
+    return failures
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run perft, search and evaluation benchmarks.")
+    parser.add_argument("--baseline", default=BASELINE_FILE)
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="allowed throughput drop before failing (0.2 = 20%%)")
+    parser.add_argument("--update-baseline", action="store_true")
+    args = parser.parse_args()
+
+    results = run_all()
+    baseline = {}
+    if os.path.exists(args.baseline):
+        with open(args.baseline) as f:
+            baseline = json.load(f)
+
+    failures = compare(results, baseline, args.threshold)
+
+    if args.update_baseline:
+        with open(args.baseline, "w") as f:
+            json.dump(results, f, indent=4)
+        print(f"Baseline written to {args.baseline}")
+    elif failures:
+        print("\n".join(["", "REGRESSIONS:"] + failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
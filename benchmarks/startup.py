@@ -0,0 +1,51 @@
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Cold start of each entry path in a fresh interpreter: the headless engine must not pull in pygame,
+# while the window path pays for pygame and its display/font initialisation.
+STARTUP_PATHS = {
+    "headless": "import engine, sys; sys.exit('pygame' in sys.modules)",
+    "ui-import": "import ui.app",
+    "ui-init": "import pygame, ui.app; pygame.init(); pygame.font.SysFont('Arial', 20)",
+}
+
+
+def time_startup(code, runs):
+    env = dict(os.environ, SDL_VIDEODRIVER=os.environ.get("SDL_VIDEODRIVER", "dummy"),
+               PYGAME_HIDE_SUPPORT_PROMPT="1")
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, "-c", code], cwd=ROOT, env=env, capture_output=True)
+        times.append(time.perf_counter() - start)
+        if result.returncode != 0:
+            return None, result.stderr.decode(errors="replace").strip() or "pygame was imported"
+    return times, None
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure cold interpreter start-up for the headless and UI paths.")
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    baseline = None
+    print(f"{'path':<10} {'median (ms)':>11} {'best (ms)':>10} {'vs python':>10}")
+    for name, code in [("python", "pass")] + list(STARTUP_PATHS.items()):
+        times, error = time_startup(code, args.runs)
+        if times is None:
+            print(f"{name:<10} FAILED: {error.splitlines()[-1]}")
+            continue
+        median = statistics.median(times) * 1000
+        if baseline is None:
+            baseline = median
+        print(f"{name:<10} {median:>11.1f} {min(times) * 1000:>10.1f} {median - baseline:>+9.1f}")
+
+
+if __name__ == "__main__":
+    main()
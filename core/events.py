@@ -7,6 +7,10 @@ class EventManager:
             self.listeners[event_type] = []
         self.listeners[event_type].append(listener)
 
+    def unsubscribe(self, event_type, listener):
+        if listener in self.listeners.get(event_type, []):
+            self.listeners[event_type].remove(listener)
+
     def trigger(self, event_type, data=None):
         if event_type in self.listeners:
             for listener in self.listeners[event_type]:
@@ -1,5 +1,6 @@
 import chess
 from core.events import game_events
+from core.move_index import MoveIndex
 from themes.assets import ClassicTheme, HighContrastTheme
 
 
@@ -20,6 +21,8 @@ class GameState:
             cls._instance.ai_difficulty = "Easy"
             cls._instance.theme_mode = "Classic"
             cls._instance.theme = ClassicTheme()
+            cls._instance.legal_moves = MoveIndex(cls._instance)
+            cls._instance.journal = None
         return cls._instance
 
     def reset(self):
@@ -29,8 +32,15 @@ class GameState:
         self.white_time = self.DEFAULT_TIME
         self.black_time = self.DEFAULT_TIME
         self.game_active = True
+        self.journal = None
         game_events.trigger("game_reset")
 
+    def set_position(self, board):
+        self.board = board
+        self.selected_square = None
+        self.journal = None
+        game_events.trigger("game_loaded")
+
     def update_timer(self, dt):
         if not self.game_active or self.board.is_game_over():
             return
@@ -49,17 +59,18 @@ class GameState:
                 game_events.trigger("game_over", "1-0")
 
     def make_move(self, move):
-        if move in self.board.legal_moves:
+        if self.legal_moves.is_legal(move):
             mover_color = self.board.turn
-            san_text = self.board.san(move)
-            self.history.append(san_text)
-            self.board.push(move)
+            self.history.append(self.board.san_and_push(move))
 
             if mover_color == chess.WHITE:
                 self.white_time = self.DEFAULT_TIME
             else:
                 self.black_time = self.DEFAULT_TIME
 
+            # Once saved, a game keeps appending its moves to the save journal.
+            if self.journal is not None:
+                self.journal.append_move(self, move)
             game_events.trigger("move_made", move)
 
             if self.board.is_game_over():
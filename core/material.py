@@ -0,0 +1,26 @@
+import chess
+from core.events import game_events
+
+FULL_SET = {chess.PAWN: 8, chess.KNIGHT: 2, chess.BISHOP: 2, chess.ROOK: 2, chess.QUEEN: 1}
+
+
+class MaterialTracker:
+    # Captured pieces per colour, refreshed only when the position changes. version lets views
+    # tell whether anything needs re-rendering.
+    def __init__(self, game):
+        self.game = game
+        self.missing = {chess.WHITE: [], chess.BLACK: []}
+        self.version = 0
+        self.refresh()
+        game_events.subscribe("move_made", self.refresh)
+        game_events.subscribe("game_reset", self.refresh)
+        game_events.subscribe("game_loaded", self.refresh)
+
+    def refresh(self, data=None):
+        board = self.game.board
+        for color in chess.COLORS:
+            missing = []
+            for p_type, count in FULL_SET.items():
+                missing += [p_type] * (count - chess.popcount(board.pieces_mask(p_type, color)))
+            self.missing[color] = missing
+        self.version += 1
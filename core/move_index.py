@@ -0,0 +1,41 @@
+import chess
+from core.events import game_events
+
+
+class MoveIndex:
+    # Legal moves of the current position grouped by from-square, built on first use after the
+    # position changes so selection, highlighting and move validation share one generation pass.
+    def __init__(self, game):
+        self.game = game
+        self.by_square = None
+        self.moves = None
+        game_events.subscribe("move_made", self.invalidate)
+        game_events.subscribe("game_reset", self.invalidate)
+        game_events.subscribe("game_loaded", self.invalidate)
+
+    def invalidate(self, data=None):
+        self.by_square = None
+        self.moves = None
+
+    def build(self):
+        self.by_square = {}
+        for move in self.game.board.legal_moves:
+            self.by_square.setdefault(move.from_square, []).append(move)
+        self.moves = {move for moves in self.by_square.values() for move in moves}
+
+    def from_square(self, square):
+        if self.by_square is None:
+            self.build()
+        return self.by_square.get(square, [])
+
+    def is_legal(self, move):
+        if self.moves is None:
+            self.build()
+        return move in self.moves
+
+    def find(self, from_square, to_square):
+        # Clicks never choose an underpromotion, so a promotion resolves to the queen.
+        for move in self.from_square(from_square):
+            if move.to_square == to_square and move.promotion in (None, chess.QUEEN):
+                return move
+        return None
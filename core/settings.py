@@ -13,4 +13,22 @@ HIGHLIGHT = (186, 202, 68)
 RED_HIGHLIGHT = (255, 80, 80)
 
 FONT_MAIN = "Arial"
-FONT_SIZE = 32
\ No newline at end of file
+FONT_SIZE = 32
+
+AI_TIME_FRACTION = 1 / 100
+AI_MIN_MOVE_TIME = 0.2
+AI_MAX_MOVE_TIME = 2.0
+AI_MAX_CLOCK_FRACTION = 1 / 4
+AI_SEARCH_WORKERS = 1
+AI_PONDER = True
+AI_PONDER_MAX_TIME = 60.0
+OPENING_BOOK_FILE = "assets/book.bin"
+BITBASE_DIR = "assets/bitbases"
+AI_TELEMETRY = False
+AI_STATS_LOG = None
+IDLE_MAX_WAIT = 1.0
+FRAME_REPORT = False
+JOURNAL_FSYNC = "always"
+JOURNAL_SNAPSHOT_INTERVAL = 20
+SAVE_DIR = "saves"
+SAVE_SLOTS = 9
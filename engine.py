@@ -0,0 +1,102 @@
+import argparse
+import chess
+import json
+
+from ai.minimax_bot import MinimaxBot
+from ai.random_bot import RandomBot
+from core.game_state import GameState
+from storage.serializer import GameSerializer
+
+DEFAULT_MOVETIME = 1.0
+
+# Headless entry point: nothing imported from here loads pygame, so scripts and servers can use the
+# engine without a display. `python engine.py --help` (or `python main.py <command>`) for the CLI.
+
+
+def create_bot(name="minimax", depth=None):
+    if name == "random":
+        return RandomBot()
+    if name != "minimax":
+        raise ValueError(f"Unknown bot '{name}'. Choose from: minimax, random")
+    return MinimaxBot(depth=depth or 3, telemetry=True)
+
+
+def search(bot, board, depth=None, movetime=DEFAULT_MOVETIME):
+    # An explicit depth means a fixed-depth search; otherwise iterative deepening within movetime.
+    if isinstance(bot, MinimaxBot) and depth is None:
+        return bot.get_move(board, time_limit=movetime)
+    return bot.get_move(board)
+
+
+def analyse(fen=chess.STARTING_FEN, depth=None, movetime=DEFAULT_MOVETIME):
+    board = chess.Board(fen)
+    bot = create_bot("minimax", depth)
+    search(bot, board, depth, movetime)
+    return bot.last_stats
+
+
+def best_move(fen=chess.STARTING_FEN, bot="minimax", depth=None, movetime=DEFAULT_MOVETIME):
+    move = search(create_bot(bot, depth), chess.Board(fen), depth, movetime)
+    return move.uci() if move is not None else None
+
+
+def play_moves(moves, fen=None):
+    # Replays UCI moves through GameState, so history, clocks and events behave exactly as in the window.
+    game = GameState()
+    game.reset()
+    if fen is not None:
+        game.set_position(chess.Board(fen))
+    for uci in moves:
+        try:
+            move = chess.Move.from_uci(uci)
+        except ValueError:
+            raise ValueError(f"Invalid move '{uci}'")
+        if not game.game_active or not game.make_move(move):
+            raise ValueError(f"Illegal move '{uci}' in position {game.board.fen()}")
+    return game
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Headless chess engine: analyse positions and play moves.")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    analyse_parser = commands.add_parser("analyse", help="search a position and print the statistics as JSON")
+    analyse_parser.add_argument("fen", nargs="?", default=chess.STARTING_FEN)
+
+    move_parser = commands.add_parser("move", help="print the bot's move for a position")
+    move_parser.add_argument("fen", nargs="?", default=chess.STARTING_FEN)
+    move_parser.add_argument("--bot", default="minimax", choices=["minimax", "random"])
+
+    play_parser = commands.add_parser("play", help="play a list of UCI moves and print the resulting game")
+    play_parser.add_argument("moves", nargs="*")
+    play_parser.add_argument("--fen")
+    play_parser.add_argument("--reply", action="store_true", help="also let the bot answer the last move")
+    play_parser.add_argument("--save", action="store_true", help="save the final position like Ctrl+S")
+
+    for command in (analyse_parser, move_parser, play_parser):
+        command.add_argument("--depth", type=int, help="fixed search depth instead of a time budget")
+        command.add_argument("--movetime", type=float, default=DEFAULT_MOVETIME)
+    args = parser.parse_args(argv)
+
+    try:
+        if args.command == "analyse":
+            print(json.dumps(analyse(args.fen, args.depth, args.movetime), indent=4))
+        elif args.command == "move":
+            print(best_move(args.fen, args.bot, args.depth, args.movetime) or "(none)")
+        else:
+            game = play_moves(args.moves, args.fen)
+            if args.reply and game.game_active and not game.board.is_game_over():
+                game.make_move(search(create_bot("minimax", args.depth), game.board, args.depth, args.movetime))
+            print(" ".join(game.history))
+            print(game.board.fen())
+            print(game.board.result())
+            if args.save:
+                GameSerializer.save_game(game)
+    except ValueError as e:
+        print(f"ERROR: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
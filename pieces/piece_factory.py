@@ -2,11 +2,15 @@ import pygame
 import chess
 from core.settings import SQUARE_SIZE
 
+SMALL_FONT_SIZE = 35
+
 
 class PieceRenderer:
-    def __init__(self, theme=None):
-        self.font_large = pygame.font.SysFont("segoe ui symbol", int(SQUARE_SIZE * 0.85))
-        self.font_small = pygame.font.SysFont("segoe ui symbol", 35)
+    def __init__(self, theme=None, square_size=SQUARE_SIZE):
+        self.theme = theme
+        self.fonts = {}
+        self.square_size = None
+        self.set_square_size(square_size)
 
         self.unicode_map = {
             chess.PAWN: "♟",
@@ -17,34 +21,83 @@ class PieceRenderer:
             chess.KING: "♚"
         }
 
+        # One atlas per (theme, colour, size): all six outlined glyphs rendered once onto a single
+        # surface, handed out as subsurfaces. Theme changes drop every atlas; atlases of other square
+        # sizes are kept until drop_square_size so switching window sizes back and forth is free.
+        self.atlases = {}
+        self.glyph_renders = 0
+        self.frame_renders = 0
+        self.frame_lookups = 0
+        self.last_frame = {"renders": 0, "lookups": 0}
+
+    def set_theme(self, theme):
+        if type(theme) is not type(self.theme):
+            self.theme = theme
+            self.atlases = {}
+
+    def set_square_size(self, square_size):
+        if square_size not in self.fonts:
+            self.fonts[square_size] = (pygame.font.SysFont("segoe ui symbol", int(square_size * 0.85)),
+                                       pygame.font.SysFont("segoe ui symbol",
+                                                           SMALL_FONT_SIZE * square_size // SQUARE_SIZE))
+        self.square_size = square_size
+        self.font_large, self.font_small = self.fonts[square_size]
+
+    def drop_square_size(self, square_size):
+        self.fonts.pop(square_size, None)
+        self.atlases = {key: atlas for key, atlas in self.atlases.items() if key[2] != square_size}
+
+    def end_frame(self):
+        self.last_frame = {"renders": self.frame_renders, "lookups": self.frame_lookups}
+        self.frame_renders = 0
+        self.frame_lookups = 0
+        return self.last_frame
+
     def get_image(self, piece):
         if piece is None:
             return None
+        return self.get_atlas(piece.color, False)[piece.piece_type]
 
-        symbol = self.unicode_map.get(piece.piece_type, "?")
-
-        if piece.color == chess.WHITE:
-            color = (255, 255, 255)
-            outline = (0, 0, 0)
-        else:
-            color = (0, 0, 0)
-            outline = (255, 255, 255)
+    def get_small_image_by_type(self, piece_type, color):
+        return self.get_atlas(color, True)[piece_type]
 
-        return self._render_text_with_outline(symbol, self.font_large, color, outline)
+    def get_atlas(self, color, small):
+        self.frame_lookups += 1
+        key = (type(self.theme), color, self.square_size, small)
+        atlas = self.atlases.get(key)
+        if atlas is None:
+            atlas = self.atlases[key] = self._build_atlas(color, small)
+        return atlas
 
-    def get_small_image_by_type(self, piece_type, color):
-        symbol = self.unicode_map.get(piece_type, "?")
+    def _symbol(self, piece_type, color):
+        if self.theme is None:
+            return self.unicode_map.get(piece_type, "?")
+        letter = chess.piece_symbol(piece_type)
+        return self.theme.get_piece_style()[letter.upper() if color == chess.WHITE else letter]
 
+    def _build_atlas(self, color, small):
+        font = self.font_small if small else self.font_large
         if color == chess.WHITE:
-            color = (255, 255, 255)
-            outline = (0, 0, 0)
+            fill, outline = (255, 255, 255), (0, 0, 0)
         else:
-            color = (0, 0, 0)
-            outline = (150, 150, 150)
+            fill, outline = (0, 0, 0), (150, 150, 150) if small else (255, 255, 255)
 
-        return self._render_text_with_outline(symbol, self.font_small, color, outline)
+        glyphs = [(piece_type, self._render_text_with_outline(self._symbol(piece_type, color), font, fill, outline))
+                  for piece_type in chess.PIECE_TYPES]
+        sheet = pygame.Surface((sum(glyph.get_width() for _, glyph in glyphs),
+                                max(glyph.get_height() for _, glyph in glyphs)), pygame.SRCALPHA)
+        atlas = {}
+        x = 0
+        for piece_type, glyph in glyphs:
+            # RGBA_MAX onto the transparent sheet copies the glyph instead of alpha-blending its edges.
+            sheet.blit(glyph, (x, 0), special_flags=pygame.BLEND_RGBA_MAX)
+            atlas[piece_type] = sheet.subsurface((x, 0, glyph.get_width(), glyph.get_height()))
+            x += glyph.get_width()
+        return atlas
 
     def _render_text_with_outline(self, text, font, color, outline_color):
+        self.glyph_renders += 1
+        self.frame_renders += 1
         base = font.render(text, True, color)
         w, h = base.get_size()
         s = pygame.Surface((w + 4, h + 4), pygame.SRCALPHA)
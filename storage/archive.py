@@ -0,0 +1,215 @@
+import argparse
+import chess
+import os
+import struct
+import time
+from storage.pgn_stream import GameRecord, format_game, read_games, write_games
+
+MAGIC = b"CGA\x01"
+FILE_HEADER_SIZE = 8
+RECORD_STRUCT = struct.Struct("<HH")
+OFFSET_STRUCT = struct.Struct("<Q")
+PROMOTION_SHIFT = 12
+MAX_FIELD = 0xFFFF
+
+
+def encode_move(move):
+    # 2 bytes: from (6 bits), to (6 bits), promotion piece (3 bits, 0 = none, 1 = knight .. 4 = queen).
+    promotion = move.promotion - 1 if move.promotion else 0
+    return move.from_square | move.to_square << 6 | promotion << PROMOTION_SHIFT
+
+
+def decode_move(code):
+    promotion = code >> PROMOTION_SHIFT
+    return chess.Move(code & 63, (code >> 6) & 63, promotion + 1 if promotion else None)
+
+
+def encode_headers(headers):
+    return "\0".join(f"{tag}\0{value}" for tag, value in headers.items()).encode("utf-8")
+
+
+def decode_headers(data):
+    fields = data.decode("utf-8").split("\0") if data else []
+    return dict(zip(fields[0::2], fields[1::2]))
+
+
+class GameArchive:
+    # Games stored back to back as [header length, move count][headers][2-byte moves], after an 8-byte file
+    # header. The offsets index lives next to it in <path>.idx, one 8-byte offset per game, so game N is two
+    # seeks away. Both files are only ever appended to; recover() lines them up again after a crash.
+    def __init__(self, path, mode="r"):
+        if mode not in ("r", "a"):
+            raise ValueError("mode must be 'r' or 'a'")
+        self.path = path
+        self.index_path = path + ".idx"
+        self.mode = mode
+        if mode == "a" and not os.path.exists(path):
+            with open(path, "wb") as f:
+                f.write(MAGIC.ljust(FILE_HEADER_SIZE, b"\0"))
+            open(self.index_path, "wb").close()
+        elif mode == "a" and not os.path.exists(self.index_path):
+            open(self.index_path, "wb").close()
+
+        file_mode = "rb" if mode == "r" else "r+b"
+        self.data = open(path, file_mode)
+        if self.data.read(FILE_HEADER_SIZE)[:len(MAGIC)] != MAGIC:
+            self.data.close()
+            raise ValueError(f"{path} is not a game archive")
+        self.index = open(self.index_path, file_mode)
+        # Kept in memory, as index entries may still sit in the write buffer.
+        self.count = os.fstat(self.index.fileno()).st_size // OFFSET_STRUCT.size
+        if mode == "a":
+            self.recover()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def __len__(self):
+        return self.count
+
+    def __iter__(self):
+        for game_id in range(len(self)):
+            yield self.read(game_id)
+
+    def close(self):
+        self.data.close()
+        self.index.close()
+
+    def flush(self, sync=False):
+        for f in (self.data, self.index):
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+
+    def offset(self, game_id):
+        self.index.seek(game_id * OFFSET_STRUCT.size)
+        return OFFSET_STRUCT.unpack(self.index.read(OFFSET_STRUCT.size))[0]
+
+    def read_raw(self, game_id):
+        # (header bytes, move codes) of one game, without building any chess objects.
+        if not 0 <= game_id < len(self):
+            raise IndexError(f"game {game_id} out of range (archive has {len(self)} games)")
+        self.data.seek(self.offset(game_id))
+        header_length, move_count = RECORD_STRUCT.unpack(self.data.read(RECORD_STRUCT.size))
+        header_data = self.data.read(header_length)
+        codes = struct.unpack(f"<{move_count}H", self.data.read(2 * move_count))
+        return header_data, codes
+
+    def read(self, game_id):
+        header_data, codes = self.read_raw(game_id)
+        return GameRecord(decode_headers(header_data), [decode_move(code) for code in codes])
+
+    def append(self, record):
+        header_data = encode_headers(record.headers)
+        if len(header_data) > MAX_FIELD or len(record.moves) > MAX_FIELD:
+            raise ValueError("game is too large for the archive format")
+        self.data.seek(0, os.SEEK_END)
+        offset = self.data.tell()
+        self.data.write(RECORD_STRUCT.pack(len(header_data), len(record.moves)) + header_data +
+                        struct.pack(f"<{len(record.moves)}H", *map(encode_move, record.moves)))
+        # The record reaches the file before the index entry that points at it.
+        self.data.flush()
+        self.index.seek(0, os.SEEK_END)
+        self.index.write(OFFSET_STRUCT.pack(offset))
+        self.count += 1
+        return self.count - 1
+
+    def extend(self, records):
+        count = 0
+        for record in records:
+            self.append(record)
+            count += 1
+        self.flush(sync=True)
+        return count
+
+    def record_end(self, position, data_end):
+        # End of the record at position, or None if it runs past data_end.
+        self.data.seek(position)
+        fields = self.data.read(RECORD_STRUCT.size)
+        if len(fields) < RECORD_STRUCT.size:
+            return None
+        header_length, move_count = RECORD_STRUCT.unpack(fields)
+        end = position + RECORD_STRUCT.size + header_length + 2 * move_count
+        return end if end <= data_end else None
+
+    def recover(self):
+        # Drop torn index entries, and entries whose record did not fully reach the data file, then drop a
+        # torn game record and index any records written after the last index entry.
+        data_end = os.fstat(self.data.fileno()).st_size
+        count = os.fstat(self.index.fileno()).st_size // OFFSET_STRUCT.size
+        position = FILE_HEADER_SIZE
+        while count:
+            end = self.record_end(self.offset(count - 1), data_end)
+            if end is not None:
+                position = end
+                break
+            count -= 1
+        self.index.truncate(count * OFFSET_STRUCT.size)
+        self.count = count
+        self.index.seek(0, os.SEEK_END)
+        while position < data_end:
+            end = self.record_end(position, data_end)
+            if end is None:
+                self.data.truncate(position)
+                break
+            self.index.write(OFFSET_STRUCT.pack(position))
+            self.count += 1
+            position = end
+        self.flush(sync=True)
+
+    def size(self):
+        return os.path.getsize(self.path) + os.path.getsize(self.index_path)
+
+
+def convert_pgn(pgn_path, archive_path):
+    # Streams a PGN file into the archive (appending if it exists). Returns (games, moves, games with errors).
+    games = moves = errors = 0
+    with GameArchive(archive_path, "a") as archive:
+        for record in read_games(pgn_path):
+            archive.append(record)
+            games += 1
+            moves += len(record.moves)
+            errors += bool(record.errors)
+        archive.flush(sync=True)
+    return games, moves, errors
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert between PGN files and the binary game archive.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    convert_parser = commands.add_parser("convert", help="append the games of a PGN file to an archive")
+    convert_parser.add_argument("pgn")
+    convert_parser.add_argument("archive")
+    export_parser = commands.add_parser("export", help="write every game of an archive as PGN")
+    export_parser.add_argument("archive")
+    export_parser.add_argument("pgn")
+    show_parser = commands.add_parser("show", help="print game N of an archive as PGN")
+    show_parser.add_argument("archive")
+    show_parser.add_argument("game", type=int)
+    args = parser.parse_args()
+
+    if args.command == "convert":
+        start = time.perf_counter()
+        games, moves, errors = convert_pgn(args.pgn, args.archive)
+        elapsed = time.perf_counter() - start
+        pgn_size = os.path.getsize(args.pgn)
+        with GameArchive(args.archive) as archive:
+            archive_size = archive.size()
+            total = len(archive)
+        print(f"{games} games ({moves} moves, {errors} with errors) in {elapsed:.2f}s "
+              f"({games / elapsed if elapsed > 0 else 0:.0f} games/s); archive now holds {total} games")
+        print(f"PGN {pgn_size} bytes -> archive {archive_size} bytes "
+              f"({archive_size / pgn_size if pgn_size else 0:.1%} of the PGN)")
+    elif args.command == "export":
+        with GameArchive(args.archive) as archive:
+            print(f"{write_games(args.pgn, archive)} games written to {args.pgn}")
+    else:
+        with GameArchive(args.archive) as archive:
+            print(format_game(archive.read(args.game)), end="")
+
+
+if __name__ == "__main__":
+    main()
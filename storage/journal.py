@@ -0,0 +1,228 @@
+import chess
+import json
+import os
+import time
+from core.settings import JOURNAL_FSYNC, JOURNAL_SNAPSHOT_INTERVAL
+
+SNAPSHOT = "s"
+MOVE = "m"
+# "always" syncs every record, "snapshot" only snapshots, "never" leaves it to the OS.
+FSYNC_POLICIES = ("always", "snapshot", "never")
+# Records are written with "t" first, so a snapshot line can be found from the end without decoding the rest.
+SNAPSHOT_PREFIX = b'{"t":"s"'
+READ_BLOCK = 1 << 16
+
+
+def rfind(f, pattern, end):
+    # Offset of the last occurrence of pattern before end, reading the file backwards in blocks.
+    position, overlap = end, b""
+    while position > 0:
+        start = max(0, position - READ_BLOCK)
+        f.seek(start)
+        block = f.read(position - start) + overlap
+        index = block.rfind(pattern)
+        if index >= 0:
+            return start + index
+        overlap = block[:len(pattern) - 1]
+        position = start
+    return -1
+
+
+def replace_file(path, text, sync=True):
+    # Written next to the target and renamed over it, so a crash mid-write leaves the old file intact.
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="") as f:
+        f.write(text)
+        f.flush()
+        if sync:
+            os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+class MoveJournal:
+    # Append-only save file of JSON lines: one small record per move and a full snapshot every few moves.
+    # Loading reads the file backwards to the last snapshot and replays only the records after it; a line torn
+    # by a crash is skipped. Each snapshot holds the SAN history since the previous one and that snapshot's
+    # offset, so the file grows linearly and the full history is one short line per snapshot away.
+    # Records are encoded on the caller's thread; with an executor (anything with submit(func, *args))
+    # the file writes run there in order instead of blocking the caller.
+    def __init__(self, path, fsync=JOURNAL_FSYNC, snapshot_interval=JOURNAL_SNAPSHOT_INTERVAL, executor=None):
+        if fsync not in FSYNC_POLICIES:
+            raise ValueError(f"Unknown fsync policy '{fsync}'. Choose from: {', '.join(FSYNC_POLICIES)}")
+        self.path = path
+        self.fsync = fsync
+        self.snapshot_interval = snapshot_interval
+        self.executor = executor
+        self.moves_since_snapshot = 0
+        # Tracked on the caller's thread, ahead of the queued writes: file size, last snapshot offset and
+        # the history length it covers.
+        self.size = 0
+        self.snapshot_offset = None
+        self.snapshot_plies = 0
+        # Set on the writing thread when a write fails; see guarded().
+        self.failed = False
+
+    def exists(self):
+        return os.path.exists(self.path)
+
+    def submit(self, func, *args):
+        if self.executor is None:
+            return func(*args)
+        return self.executor.submit(func, *args)
+
+    def start(self, game):
+        self.submit(self.replace, self.snapshot_line(game, fresh=True), self.fsync != "never")
+
+    def snapshot(self, game):
+        self.submit(self.write, self.snapshot_line(game), self.fsync != "never")
+
+    def append_move(self, game, move):
+        record = {"t": MOVE, "m": move.uci(), "s": game.history[-1], "w": round(game.white_time, 3),
+                  "b": round(game.black_time, 3), "ts": round(time.time(), 3)}
+        line = self.encode(record)
+        self.size += len(line)
+        self.submit(self.write, line, self.fsync == "always")
+        self.moves_since_snapshot += 1
+        if self.moves_since_snapshot >= self.snapshot_interval:
+            self.snapshot(game)
+
+    def snapshot_line(self, game, fresh=False):
+        # A fresh journal replaces the file, so its first snapshot carries the whole history.
+        if fresh:
+            self.size = self.snapshot_plies = 0
+            self.snapshot_offset = None
+        line = self.encode(self.snapshot_record(game, self.snapshot_offset, game.history[self.snapshot_plies:]))
+        self.snapshot_offset = self.size
+        self.snapshot_plies = len(game.history)
+        self.size += len(line)
+        self.moves_since_snapshot = 0
+        return line
+
+    def snapshot_record(self, game, previous, history):
+        # The board is stored as the position after the last capture or pawn move plus the moves since
+        # (always at least the last move), which is all python-chess needs for repetition and the last-move
+        # highlight. The clock is read before popping, since every pop lowers it.
+        board = game.board.copy()
+        count = max(board.halfmove_clock, 1)
+        reversible = []
+        while board.move_stack and len(reversible) < count:
+            reversible.append(board.pop().uci())
+        return {"t": SNAPSHOT, "fen": board.fen(), "moves": reversible[::-1], "prev": previous, "history": history,
+                "w": round(game.white_time, 3), "b": round(game.black_time, 3), "mode": game.mode,
+                "difficulty": game.ai_difficulty, "theme": game.theme_mode, "ts": round(time.time(), 3)}
+
+    def encode(self, record):
+        # ASCII only, so the length of a line is its size in bytes.
+        return json.dumps(record, separators=(",", ":")) + "\n"
+
+    def replace(self, line, sync):
+        self.guarded(replace_file, self.path, line, sync)
+
+    def write(self, line, sync):
+        self.guarded(self.append_line, line, sync)
+
+    def guarded(self, func, *args):
+        # After a failed write the offsets tracked by the caller no longer match the file, and a later snapshot
+        # would point into the middle of a line. Nothing more is written; the owner detaches the journal.
+        if self.failed:
+            raise OSError(f"{self.path}: not written after an earlier failed write")
+        try:
+            func(*args)
+        except Exception:
+            self.failed = True
+            raise
+
+    def append_line(self, line, sync):
+        with open(self.path, "a", newline="") as f:
+            f.write(line)
+            f.flush()
+            if sync:
+                os.fsync(f.fileno())
+
+    def repair(self):
+        # Drop a last line left half-written by a crash, so new records start on a line of their own.
+        with open(self.path, "rb+") as f:
+            end = f.seek(0, os.SEEK_END)
+            f.seek(max(0, end - 1))
+            if end and f.read(1) != b"\n":
+                f.truncate(rfind(f, b"\n", end) + 1)
+
+    def read_tail(self):
+        # (offset, records) from the last snapshot on. Only those lines are read and decoded.
+        with open(self.path, "rb") as f:
+            end = file_end = f.seek(0, os.SEEK_END)
+            while True:
+                offset = rfind(f, SNAPSHOT_PREFIX, end)
+                if offset < 0:
+                    raise ValueError("journal has no snapshot")
+                f.seek(offset)
+                lines = f.read(file_end - offset).splitlines()
+                try:
+                    records = [json.loads(lines[0])]
+                except ValueError:
+                    end = offset
+                    continue
+                for line in lines[1:]:
+                    try:
+                        records.append(json.loads(line))
+                    except ValueError:
+                        continue
+                return offset, records
+
+    def read_history(self, snapshot):
+        # Follows the chain of snapshots back to the first one.
+        parts = [snapshot["history"]]
+        with open(self.path, "rb") as f:
+            previous = snapshot["prev"]
+            while previous is not None:
+                f.seek(previous)
+                line = f.readline()
+                if not line.startswith(SNAPSHOT_PREFIX):
+                    raise ValueError(f"journal snapshot chain is broken at offset {previous}")
+                record = json.loads(line)
+                parts.append(record["history"])
+                previous = record["prev"]
+        return [san for part in reversed(parts) for san in part]
+
+    def read_state(self):
+        # Reads and replays the journal without touching the game, so it can run off the main thread.
+        self.repair()
+        offset, records = self.read_tail()
+        snapshot = records[0]
+        board = chess.Board(snapshot["fen"])
+        for uci in snapshot["moves"]:
+            board.push_uci(uci)
+        history = self.read_history(snapshot)
+        plies = len(history)
+        white_time, black_time = snapshot["w"], snapshot["b"]
+        for record in records[1:]:
+            board.push_uci(record["m"])
+            history.append(record["s"])
+            white_time, black_time = record["w"], record["b"]
+        return {"board": board, "history": history, "white_time": white_time, "black_time": black_time,
+                "mode": snapshot["mode"], "difficulty": snapshot["difficulty"], "theme": snapshot["theme"],
+                "moves_since_snapshot": len(records) - 1, "size": os.path.getsize(self.path),
+                "snapshot_offset": offset, "snapshot_plies": plies}
+
+    def apply(self, game, state):
+        board = state["board"]
+        game.history = state["history"]
+        game.white_time = state["white_time"]
+        game.black_time = state["black_time"]
+        game.mode = state["mode"]
+        game.ai_difficulty = state["difficulty"]
+        game.game_active = game.white_time > 0 and game.black_time > 0 and not board.is_game_over()
+        if game.theme_mode != state["theme"]:
+            game.toggle_theme()
+        game.set_position(board)
+        game.journal = self
+        self.moves_since_snapshot = state["moves_since_snapshot"]
+        self.size = state["size"]
+        self.snapshot_offset = state["snapshot_offset"]
+        self.snapshot_plies = state["snapshot_plies"]
+
+    def restore(self, game):
+        self.apply(game, self.read_state())
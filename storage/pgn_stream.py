@@ -0,0 +1,91 @@
+import chess
+import chess.pgn
+
+LINE_WIDTH = 80
+
+
+class GameRecord:
+    # One game as headers plus mainline moves: all the archive keeps, without python-chess's node tree.
+    def __init__(self, headers=None, moves=None, errors=None):
+        self.headers = dict(headers or {})
+        self.moves = list(moves or [])
+        self.errors = list(errors or [])
+
+    def board(self):
+        fen = self.headers.get("FEN")
+        return chess.Board(fen) if fen else chess.Board()
+
+
+class RecordVisitor(chess.pgn.BaseVisitor):
+    # Collects headers and mainline moves only; comments, NAGs and variations are skipped while parsing.
+    def begin_game(self):
+        self.record = GameRecord()
+
+    def visit_header(self, tagname, tagvalue):
+        self.record.headers[tagname] = tagvalue
+
+    def begin_variation(self):
+        return chess.pgn.SKIP
+
+    def visit_move(self, board, move):
+        # Moves after an illegal or unreadable one would not follow from the recorded position.
+        if not self.record.errors:
+            self.record.moves.append(move)
+
+    def handle_error(self, error):
+        self.record.errors.append(error)
+
+    def result(self):
+        return self.record
+
+
+def read_games(source):
+    # Generator over a PGN file path or open text handle; one game is in memory at a time.
+    if isinstance(source, str):
+        with open(source, encoding="utf-8", errors="replace") as handle:
+            yield from read_games(handle)
+        return
+    while True:
+        record = chess.pgn.read_game(source, Visitor=RecordVisitor)
+        if record is None:
+            return
+        yield record
+
+
+def format_game(record):
+    # Tag values are written verbatim, as python-chess does, so they read back unchanged.
+    lines = [f'[{tag} "{value}"]' for tag, value in record.headers.items()]
+    lines.append("")
+
+    tokens = []
+    board = record.board()
+    for move in record.moves:
+        if board.turn == chess.WHITE:
+            tokens.append(f"{board.fullmove_number}.")
+        elif not tokens:
+            tokens.append(f"{board.fullmove_number}...")
+        tokens.append(board.san(move))
+        board.push(move)
+    tokens.append(record.headers.get("Result", "*"))
+
+    line = ""
+    for token in tokens:
+        if line and len(line) + 1 + len(token) > LINE_WIDTH:
+            lines.append(line)
+            line = token
+        else:
+            line = f"{line} {token}" if line else token
+    lines.append(line)
+    return "\n".join(lines) + "\n\n"
+
+
+def write_games(target, records):
+    # Streams records to a PGN file path or open text handle and returns how many were written.
+    if isinstance(target, str):
+        with open(target, "w", encoding="utf-8") as handle:
+            return write_games(handle, records)
+    count = 0
+    for record in records:
+        target.write(format_game(record))
+        count += 1
+    return count
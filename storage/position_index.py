@@ -0,0 +1,210 @@
+import argparse
+import chess
+import chess.polyglot
+import heapq
+import mmap
+import os
+import struct
+import tempfile
+from ai.search_board import SearchBoard
+from storage.archive import GameArchive, decode_headers, decode_move
+
+MAGIC = b"CPI\x01"
+HEADER_STRUCT = struct.Struct("<4sI")
+# Polyglot hash of the position, game id, ply, archive code of the move played next (NO_MOVE at the end of
+# the game) and the game result, so move statistics never need to touch the archive.
+ENTRY_STRUCT = struct.Struct("<QIHHB")
+NO_MOVE = 0xFFFF
+RESULTS = {"1-0": 1, "1/2-1/2": 2, "0-1": 3}
+RUN_ENTRIES = 1 << 20
+READ_ENTRIES = 4096
+
+
+def game_entries(game_id, header_data, codes):
+    headers = decode_headers(header_data)
+    fen = headers.get("FEN")
+    board = chess.Board(fen) if fen else chess.Board()
+    result = RESULTS.get(headers.get("Result"), 0)
+    search_board = SearchBoard(board)
+    entries = []
+    for ply, code in enumerate(codes):
+        entries.append((search_board.hash, game_id, ply, code, result))
+        search_board.advance(search_board.encode_move(decode_move(code)))
+    entries.append((search_board.hash, game_id, len(codes), NO_MOVE, result))
+    return entries
+
+
+def iter_entries(f, start=HEADER_STRUCT.size):
+    f.seek(start)
+    while True:
+        block = f.read(ENTRY_STRUCT.size * READ_ENTRIES)
+        if not block:
+            return
+        yield from ENTRY_STRUCT.iter_unpack(block)
+
+
+def write_index(path, game_count, entries):
+    with open(path, "wb") as f:
+        f.write(HEADER_STRUCT.pack(MAGIC, game_count))
+        for entry in entries:
+            f.write(ENTRY_STRUCT.pack(*entry))
+        f.flush()
+        os.fsync(f.fileno())
+
+
+class PositionIndex:
+    # Every position of every archived game, sorted by Polyglot hash in <archive>.pos and memory-mapped,
+    # so a lookup is a binary search over the file. update() indexes newly appended games: they are sorted
+    # in bounded runs and merged with the existing table into a new file that replaces the old one.
+    def __init__(self, archive_path, index_path=None):
+        self.archive_path = archive_path
+        self.path = index_path or archive_path + ".pos"
+        self.file = None
+        self.map = None
+        self.game_count = 0
+        self.entry_count = 0
+        if os.path.exists(self.path):
+            self.open()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def open(self):
+        self.file = open(self.path, "rb")
+        magic, self.game_count = HEADER_STRUCT.unpack(self.file.read(HEADER_STRUCT.size))
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{self.path} is not a position index")
+        self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        self.entry_count = (len(self.map) - HEADER_STRUCT.size) // ENTRY_STRUCT.size
+
+    def close(self):
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+
+    def update(self):
+        # Returns the number of games added to the index.
+        with GameArchive(self.archive_path) as archive:
+            first, last = self.game_count, len(archive)
+            if first >= last:
+                return 0
+            directory = os.path.dirname(os.path.abspath(self.path))
+            runs = []
+            try:
+                entries = []
+                for game_id in range(first, last):
+                    entries.extend(game_entries(game_id, *archive.read_raw(game_id)))
+                    if len(entries) >= RUN_ENTRIES:
+                        runs.append(self.write_run(entries, directory))
+                        entries = []
+                entries.sort()
+
+                sources = [iter_entries(run) for run in runs] + [iter(entries)]
+                if self.file is not None:
+                    sources.insert(0, iter_entries(self.file))
+                tmp_path = self.path + ".tmp"
+                write_index(tmp_path, last, heapq.merge(*sources))
+            finally:
+                for run in runs:
+                    run.close()
+        self.close()
+        os.replace(tmp_path, self.path)
+        self.open()
+        return last - first
+
+    def write_run(self, entries, directory):
+        entries.sort()
+        run = tempfile.TemporaryFile(dir=directory)
+        run.write(HEADER_STRUCT.pack(MAGIC, 0))
+        for entry in entries:
+            run.write(ENTRY_STRUCT.pack(*entry))
+        return run
+
+    def entry(self, position):
+        return ENTRY_STRUCT.unpack_from(self.map, HEADER_STRUCT.size + position * ENTRY_STRUCT.size)
+
+    def lookup(self, position, limit=None):
+        # (game id, ply) for every time a game reached the position, given as a chess.Board or FEN.
+        return [(game_id, ply) for _, game_id, ply, _, _ in self.entries(position, limit)]
+
+    def entries(self, position, limit=None):
+        if self.map is None:
+            return []
+        board = chess.Board(position) if isinstance(position, str) else position
+        key = chess.polyglot.zobrist_hash(board)
+        low, high = 0, self.entry_count
+        while low < high:
+            middle = (low + high) // 2
+            if self.entry(middle)[0] < key:
+                low = middle + 1
+            else:
+                high = middle
+        found = []
+        while low < self.entry_count and (limit is None or len(found) < limit):
+            entry = self.entry(low)
+            if entry[0] != key:
+                break
+            found.append(entry)
+            low += 1
+        return found
+
+    def games(self, position):
+        return sorted({game_id for game_id, _ in self.lookup(position)})
+
+    def move_stats(self, position):
+        # Moves played from the position, most frequent first, with the results of the games they were played in.
+        board = chess.Board(position) if isinstance(position, str) else position
+        stats = {}
+        for _, _, _, code, result in self.entries(board):
+            if code == NO_MOVE:
+                continue
+            move = decode_move(code)
+            if move not in stats:
+                stats[move] = {"move": move.uci(), "san": board.san(move), "games": 0,
+                               "white_wins": 0, "draws": 0, "black_wins": 0}
+            entry = stats[move]
+            entry["games"] += 1
+            if result == 1:
+                entry["white_wins"] += 1
+            elif result == 2:
+                entry["draws"] += 1
+            elif result == 3:
+                entry["black_wins"] += 1
+        return sorted(stats.values(), key=lambda entry: -entry["games"])
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Build and query the position index of a game archive.")
+    commands = parser.add_subparsers(dest="command", required=True)
+    update_parser = commands.add_parser("update", help="index games appended since the last update")
+    update_parser.add_argument("archive")
+    query_parser = commands.add_parser("query", help="games and move statistics for a position")
+    query_parser.add_argument("archive")
+    query_parser.add_argument("fen", nargs="?", default=chess.STARTING_FEN)
+    query_parser.add_argument("--limit", type=int, default=20, help="game ids to list")
+    args = parser.parse_args()
+
+    with PositionIndex(args.archive) as index:
+        if args.command == "update":
+            added = index.update()
+            print(f"Indexed {added} new games: {index.game_count} games, {index.entry_count} positions.")
+            return
+        if index.map is None:
+            print(f"No position index for {args.archive}; run 'update' first.")
+            return
+        games = index.games(args.fen)
+        print(f"{len(games)} games reached this position: {' '.join(map(str, games[:args.limit]))}")
+        for entry in index.move_stats(args.fen):
+            print(f"{entry['san']:<8} {entry['games']:>7} games  +{entry['white_wins']} ={entry['draws']} "
+                  f"-{entry['black_wins']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+import chess
+import json
+import os
+import queue
+import time
+from concurrent.futures import ThreadPoolExecutor
+from core.events import game_events
+from core.settings import SAVE_DIR, SAVE_SLOTS
+from storage.journal import MoveJournal, replace_file
+from storage.serializer import GameSerializer, JOURNAL_FILE, SAVE_FILE
+
+INDEX_FILE = "index.json"
+
+
+class SaveManager:
+    # Saves and loads run in order on one background thread, so disk latency never holds up a frame.
+    # The game is snapshotted on the main thread before a job is queued, and results come back through
+    # poll(), which applies them and reports them as game_events on the main thread.
+    # Each slot is a move journal in saves/. The slot index is kept in memory, where the entry of the slot
+    # being played follows every move, and is written to index.json on save, load and shutdown.
+    def __init__(self, game, directory=SAVE_DIR, slot_count=SAVE_SLOTS):
+        self.game = game
+        self.directory = directory
+        self.slot_count = slot_count
+        self.index_path = os.path.join(directory, INDEX_FILE)
+        self.executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="save")
+        self.results = queue.SimpleQueue()
+        self.pending = 0
+        self.slots = self.read_index()
+        self.active_journal = None
+        self.active_slot = None
+        self.index_changed = False
+        game_events.subscribe("move_made", self.on_move_made)
+
+    def read_index(self):
+        try:
+            with open(self.index_path) as f:
+                return {int(slot): info for slot, info in json.load(f).items()}
+        except (OSError, ValueError):
+            return {}
+
+    def slot_path(self, slot):
+        return os.path.join(self.directory, f"slot{slot}.journal")
+
+    def describe(self, slot):
+        info = self.slots.get(slot)
+        if info is None:
+            return f"Slot {slot}: empty"
+        return f"Slot {slot}: {info['moves']} moves, {info['turn']} to move, {info['mode']}, saved {info['saved']}"
+
+    def submit(self, func, *args, done=None):
+        # Also the executor of the slot journals, so moves appended during play queue behind saves.
+        self.pending += 1
+        return self.executor.submit(self.run, func, args, done)
+
+    def run(self, func, args, done):
+        try:
+            value, error = func(*args), None
+        except Exception as e:
+            value, error = None, e
+        self.results.put((done, value, error))
+
+    def busy(self):
+        return self.pending > 0
+
+    def poll(self):
+        while True:
+            try:
+                done, value, error = self.results.get_nowait()
+            except queue.Empty:
+                return
+            self.pending -= 1
+            if done is not None:
+                done(value, error)
+            elif error is not None:
+                self.write_failed(error)
+
+    def write_failed(self, error):
+        # A failed journal write detaches the journal: the game goes on unsaved until the next Ctrl+S.
+        journal = self.game.journal
+        if journal is not None and journal.failed:
+            self.game.journal = None
+            if journal is self.active_journal:
+                self.active_journal = self.active_slot = None
+            print(f"ERROR: Could not write save, moves are no longer saved until the game is saved again. {error}")
+        else:
+            print(f"ERROR: Could not write save. {error}")
+        game_events.trigger("game_save_failed", error)
+
+    def slot_info(self):
+        return {"moves": len(self.game.history), "turn": "White" if self.game.board.turn == chess.WHITE else "Black",
+                "mode": self.game.mode, "saved": time.strftime("%Y-%m-%d %H:%M")}
+
+    def on_move_made(self, data=None):
+        if self.game.journal is None or self.game.journal is not self.active_journal:
+            return
+        self.slots[self.active_slot] = self.slot_info()
+        self.index_changed = True
+
+    def write_index(self):
+        self.index_changed = False
+        self.submit(replace_file, self.index_path, json.dumps(self.slots, indent=2))
+
+    def save(self, slot):
+        game = self.game
+        path = self.slot_path(slot)
+        journal = game.journal
+        fresh = journal is None or journal.path != path
+        if fresh:
+            journal = MoveJournal(path, executor=self)
+        line = journal.snapshot_line(game, fresh)
+        game.journal = journal
+        self.active_journal, self.active_slot = journal, slot
+
+        previous = self.slots.get(slot)
+        self.slots[slot] = self.slot_info()
+        self.index_changed = False
+        index = json.dumps(self.slots, indent=2)
+        self.submit(self.write_save, journal, line, fresh, index,
+                    done=lambda value, error: self.saved(journal, slot, previous, error))
+
+    def write_save(self, journal, line, fresh, index):
+        sync = journal.fsync != "never"
+        if fresh:
+            journal.replace(line, sync)
+        else:
+            journal.write(line, sync)
+        replace_file(self.index_path, index)
+
+    def saved(self, journal, slot, previous, error):
+        if error is None:
+            print(f"Game Saved Successfully to slot {slot}")
+            game_events.trigger("game_saved", slot)
+            return
+        if previous is None:
+            self.slots.pop(slot, None)
+        else:
+            self.slots[slot] = previous
+        if self.game.journal is journal:
+            self.game.journal = None
+        print(f"ERROR: Could not save game. {error}")
+        game_events.trigger("game_save_failed", error)
+
+    def load(self, slot):
+        self.submit(self.read_slot, slot, done=lambda value, error: self.loaded(slot, value, error))
+
+    def read_slot(self, slot):
+        # Runs on the worker: (journal, state) for a slot journal, (None, data) for a savegame.json from
+        # before the journal, or None if there is nothing to load.
+        journal = MoveJournal(self.slot_path(slot), executor=self)
+        if not journal.exists() and slot == 1:
+            # Saves from before slots live in the working directory.
+            journal = MoveJournal(JOURNAL_FILE, executor=self)
+            if not journal.exists() and os.path.exists(SAVE_FILE):
+                return None, GameSerializer.read_legacy()
+        if not journal.exists():
+            return None
+        return journal, journal.read_state()
+
+    def loaded(self, slot, value, error):
+        # game_loaded is triggered on the main thread once the state is applied.
+        try:
+            if error is not None:
+                raise error
+            if value is None:
+                print(f"No save in slot {slot}.")
+                return
+            journal, state = value
+            if journal is None:
+                GameSerializer.apply_legacy(self.game, state)
+                return
+            journal.apply(self.game, state)
+        except Exception as e:
+            print(f"ERROR: Could not load game. {e}")
+            game_events.trigger("game_load_failed", e)
+            return
+        if journal.path == self.slot_path(slot):
+            self.active_journal, self.active_slot = journal, slot
+            self.slots[slot] = self.slot_info()
+            self.write_index()
+        print(f"Game Loaded from slot {slot}! {len(self.game.history)} moves, turn: "
+              f"{'White' if self.game.board.turn == chess.WHITE else 'Black'}")
+
+    def shutdown(self):
+        # Pending writes are finished, not dropped, before the window closes.
+        game_events.unsubscribe("move_made", self.on_move_made)
+        if self.index_changed:
+            self.write_index()
+        self.executor.shutdown(wait=True)
+        self.poll()
@@ -1,24 +1,25 @@
 import json
 import chess
 import os
+from core.events import game_events
+from storage.journal import MoveJournal
 
 SAVE_FILE = "savegame.json"
+JOURNAL_FILE = "savegame.journal"
 
 
 class GameSerializer:
     @staticmethod
     def save_game(game_state):
-        data = {
-            "fen": game_state.board.fen(),
-            "theme": game_state.theme_mode,
-            "turn": "White" if game_state.board.turn == chess.WHITE else "Black",
-            "history_count": len(game_state.history)
-        }
-
+        # The first save starts a fresh journal; after that every move is appended as it is played,
+        # so saving again only adds a snapshot.
         try:
-            with open(SAVE_FILE, "w") as f:
-                json.dump(data, f, indent=4)
-            print(f"Game Saved Successfully to {SAVE_FILE}")
+            if game_state.journal is None:
+                game_state.journal = MoveJournal(JOURNAL_FILE)
+                game_state.journal.start(game_state)
+            else:
+                game_state.journal.snapshot(game_state)
+            print(f"Game Saved Successfully to {JOURNAL_FILE}")
             return True
         except Exception as e:
             print(f"ERROR: Could not save game. {e}")
@@ -26,29 +27,48 @@ class GameSerializer:
 
     @staticmethod
     def load_game(game_state):
+        journal = MoveJournal(JOURNAL_FILE)
+        if journal.exists():
+            try:
+                journal.restore(game_state)
+                print(f"Game Loaded! {len(game_state.history)} moves, turn: "
+                      f"{'White' if game_state.board.turn == chess.WHITE else 'Black'}")
+                return True
+            except Exception as e:
+                print(f"ERROR: Could not load game. {e}")
+                return False
+
+        # Saves from before the journal only hold a position.
         if not os.path.exists(SAVE_FILE):
             print("No save file found.")
             return False
 
         try:
-            with open(SAVE_FILE, "r") as f:
-                data = json.load(f)
-
-            game_state.board.set_fen(data["fen"])
-
-            if data["theme"] == "High Contrast":
-                if game_state.theme_mode != "High Contrast":
-                    game_state.toggle_theme()
-            elif data["theme"] == "Classic":
-                if game_state.theme_mode != "Classic":
-                    game_state.toggle_theme()
-
-            print(f"Game Loaded! Turn: {data['turn']}")
+            GameSerializer.apply_legacy(game_state, GameSerializer.read_legacy())
             return True
-
         except json.JSONDecodeError:
             print("ERROR: Save file is corrupted.")
             return False
         except Exception as e:
             print(f"ERROR: Could not load game. {e}")
             return False
+
+    @staticmethod
+    def read_legacy():
+        with open(SAVE_FILE, "r") as f:
+            return json.load(f)
+
+    @staticmethod
+    def apply_legacy(game_state, data):
+        game_state.board.set_fen(data["fen"])
+        game_state.journal = None
+
+        if data["theme"] == "High Contrast":
+            if game_state.theme_mode != "High Contrast":
+                game_state.toggle_theme()
+        elif data["theme"] == "Classic":
+            if game_state.theme_mode != "Classic":
+                game_state.toggle_theme()
+
+        game_events.trigger("game_loaded")
+        print(f"Game Loaded! Turn: {data['turn']}")
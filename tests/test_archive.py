@@ -0,0 +1,65 @@
+import os
+import struct
+import tempfile
+import unittest
+import chess
+from storage.archive import GameArchive
+from storage.pgn_stream import GameRecord
+
+
+def record(round_number):
+    moves = [chess.Move.from_uci(uci) for uci in ("e2e4", "e7e5", "g1f3")]
+    return GameRecord({"Event": "Test", "Round": str(round_number), "Result": "*"}, moves)
+
+
+class GameArchiveRecoveryTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "games.cga")
+        with GameArchive(self.path, "a") as archive:
+            archive.extend(record(n) for n in range(3))
+        self.data_size = os.path.getsize(self.path)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def reopen(self):
+        with GameArchive(self.path, "a") as archive:
+            return [game.headers["Round"] for game in archive]
+
+    def test_index_entry_past_end_of_data(self):
+        with open(self.path + ".idx", "ab") as f:
+            f.write(struct.pack("<Q", self.data_size))
+        self.assertEqual(self.reopen(), ["0", "1", "2"])
+
+    def test_index_entry_for_torn_record(self):
+        with open(self.path, "ab") as f:
+            f.write(struct.pack("<HH", 40, 3) + b"Event\0")
+        with open(self.path + ".idx", "ab") as f:
+            f.write(struct.pack("<Q", self.data_size))
+        self.assertEqual(self.reopen(), ["0", "1", "2"])
+        self.assertEqual(os.path.getsize(self.path), self.data_size)
+
+    def test_unindexed_record_is_recovered(self):
+        with GameArchive(self.path, "a") as archive:
+            archive.append(record(3))
+            archive.data.flush()
+        with open(self.path + ".idx", "rb+") as f:
+            f.truncate(3 * 8 + 5)
+        self.assertEqual(self.reopen(), ["0", "1", "2", "3"])
+
+
+class GameArchiveAppendTest(unittest.TestCase):
+    def test_append_returns_ids_while_open(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "games.cga")
+            with GameArchive(path, "a") as archive:
+                self.assertEqual([archive.append(record(n)) for n in range(4)], [0, 1, 2, 3])
+                self.assertEqual(len(archive), 4)
+                self.assertEqual([game.headers["Round"] for game in archive], ["0", "1", "2", "3"])
+            with GameArchive(path) as archive:
+                self.assertEqual(len(archive), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,87 @@
+import json
+import os
+import tempfile
+import unittest
+import chess
+from core.game_state import GameState
+from storage.journal import MoveJournal
+
+
+class MoveJournalTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "game.journal")
+        self.game = GameState()
+        self.game.reset()
+
+    def tearDown(self):
+        self.game.reset()
+        self.directory.cleanup()
+
+    def play(self, *moves):
+        for uci in moves:
+            self.assertTrue(self.game.make_move(chess.Move.from_uci(uci)))
+
+    def reload(self):
+        board = self.game.board.copy()
+        self.game.reset()
+        MoveJournal(self.path).restore(self.game)
+        return board
+
+    def test_reload_keeps_threefold_repetition(self):
+        self.play("e2e4", "e7e5", "g1f3", "b8c6", "f3g1", "c6b8", "g1f3", "b8c6", "f3g1", "c6b8")
+        MoveJournal(self.path).start(self.game)
+        board = self.reload()
+        self.assertTrue(board.can_claim_threefold_repetition())
+        self.assertTrue(self.game.board.can_claim_threefold_repetition())
+        self.assertEqual(self.game.board.peek(), board.peek())
+
+    def test_reload_keeps_last_move_after_pawn_move(self):
+        self.play("e2e4", "e7e5", "g1f3", "b8c6", "d2d4")
+        MoveJournal(self.path).start(self.game)
+        board = self.reload()
+        self.assertEqual(self.game.board.fen(), board.fen())
+        self.assertEqual(self.game.board.peek(), chess.Move.from_uci("d2d4"))
+
+    def test_snapshots_chain_history_and_reload_reads_tail(self):
+        journal = MoveJournal(self.path, snapshot_interval=4)
+        journal.start(self.game)
+        self.game.journal = journal
+        for _ in range(5):
+            self.play("g1f3", "g8f6", "f3g1", "f6g8")
+        history = list(self.game.history)
+        with open(self.path) as f:
+            snapshots = [record for record in map(json.loads, f) if record["t"] == "s"]
+        self.assertEqual(len(snapshots), 6)
+        self.assertTrue(all(len(record["history"]) == 4 for record in snapshots[1:]))
+        self.reload()
+        self.assertEqual(self.game.history, history)
+        self.assertEqual(self.game.journal.moves_since_snapshot, 0)
+
+        self.play("e2e4")
+        with open(self.path, "a") as f:
+            f.write('{"t":"m","m":"e7')
+        self.reload()
+        self.assertEqual(self.game.history, history + ["e4"])
+        self.play("e7e5")
+        self.reload()
+        self.assertEqual(self.game.history, history + ["e4", "e5"])
+
+    def test_broken_snapshot_chain_is_reported(self):
+        journal = MoveJournal(self.path, snapshot_interval=2)
+        journal.start(self.game)
+        self.game.journal = journal
+        self.play("e2e4", "e7e5")
+        with open(self.path) as f:
+            lines = f.readlines()
+        record = json.loads(lines[-1])
+        record["prev"] += 3
+        lines[-1] = json.dumps(record, separators=(",", ":")) + "\n"
+        with open(self.path, "w") as f:
+            f.writelines(lines)
+        with self.assertRaisesRegex(ValueError, "chain is broken"):
+            MoveJournal(self.path).read_state()
+
+
+if __name__ == "__main__":
+    unittest.main()
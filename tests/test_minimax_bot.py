@@ -0,0 +1,19 @@
+import time
+import unittest
+import chess
+from ai.minimax_bot import MinimaxBot
+
+
+class MinimaxBotResetTest(unittest.TestCase):
+    def test_reset_waits_for_a_cancelled_search(self):
+        bot = MinimaxBot(depth=3, bitbase_dir=None)
+        request = bot.request_move(chess.Board(), time_limit=30)
+        time.sleep(0.3)
+        request.cancel()
+        bot.on_game_reset()
+        self.assertTrue(request.done())
+        self.assertEqual(bot.tt.used, 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+import chess
+from ai.minimax_bot import MinimaxBot
+from ai.ponder import Ponderer
+from core.events import game_events
+
+
+class ParallelSearchTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.bot = MinimaxBot(depth=3, workers=2, telemetry=True, bitbase_dir=None)
+        cls.board = chess.Board()
+        cls.move = cls.bot.get_move(cls.board)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.bot.shutdown()
+
+    def test_stats_include_worker_counters_and_pv(self):
+        stats = self.bot.last_stats
+        self.assertEqual(len(stats["pv"]), 3)
+        self.assertEqual(stats["pv"][0], self.move.uci())
+        self.assertGreater(stats["beta_cutoffs"], 0)
+        self.assertGreater(stats["qnodes"], 0)
+
+    def test_pv_walk_does_not_count_probes(self):
+        probes = self.bot.tt.probes
+        self.bot.report_stats(self.board, self.move, [], 1.0, probes, self.bot.tt.hits)
+        self.assertEqual(self.bot.tt.probes, probes)
+
+    def test_ponder_predicts_reply(self):
+        ponderer = Ponderer(self.bot)
+        try:
+            board = self.board.copy()
+            board.push(self.move)
+            self.assertEqual(ponderer.predict_reply(board).uci(), self.bot.last_stats["pv"][1])
+        finally:
+            game_events.unsubscribe("move_made", ponderer.on_move_made)
+            game_events.unsubscribe("game_reset", ponderer.on_game_reset)
+            game_events.unsubscribe("game_over", ponderer.on_game_over)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+import chess
+from core.events import game_events
+from core.game_state import GameState
+from storage.save_worker import SaveManager
+
+
+class SaveManagerTest(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.game = GameState()
+        self.game.reset()
+        self.saves = SaveManager(self.game, os.path.join(self.directory.name, "saves"))
+
+    def tearDown(self):
+        self.saves.shutdown()
+        self.game.reset()
+        self.directory.cleanup()
+
+    def wait(self):
+        while self.saves.busy():
+            time.sleep(0.005)
+            self.saves.poll()
+
+    def play(self, *moves):
+        for uci in moves:
+            self.assertTrue(self.game.make_move(chess.Move.from_uci(uci)))
+
+    def test_slot_index_follows_appended_moves(self):
+        self.play("e2e4")
+        self.saves.save(2)
+        self.play("e7e5", "g1f3")
+        self.wait()
+        self.assertEqual(self.saves.slots[2]["moves"], 3)
+        self.assertEqual(self.saves.read_index()[2]["moves"], 1)
+
+        history = list(self.game.history)
+        self.game.reset()
+        self.saves.load(2)
+        self.wait()
+        self.assertEqual(self.game.history, history)
+        self.play("b8c6")
+        self.assertEqual(self.saves.slots[2]["moves"], 4)
+        self.saves.shutdown()
+        self.assertEqual(self.saves.read_index()[2]["moves"], 4)
+        self.assertNotIn(self.saves.on_move_made, game_events.listeners["move_made"])
+
+    def test_failed_write_detaches_the_journal(self):
+        self.play("e2e4")
+        self.saves.save(3)
+        self.wait()
+        path = self.saves.slot_path(3)
+        os.rename(path, path + ".moved")
+        os.mkdir(path)
+        self.play("e7e5")
+        self.wait()
+        self.assertIsNone(self.game.journal)
+
+        os.rmdir(path)
+        self.play("g1f3")
+        self.saves.save(3)
+        self.wait()
+        history = list(self.game.history)
+        self.game.reset()
+        self.saves.load(3)
+        self.wait()
+        self.assertEqual(self.game.history, history)
+
+    def test_legacy_save_loads_on_the_worker(self):
+        fen = "rnbqkbnr/pppppppp/8/8/4P3/8/PPPP1PPP/RNBQKBNR b KQkq - 0 1"
+        cwd = os.getcwd()
+        os.chdir(self.directory.name)
+        try:
+            with open("savegame.json", "w") as f:
+                json.dump({"fen": fen, "turn": "Black", "theme": "Classic"}, f)
+            self.saves.load(1)
+            self.assertNotEqual(self.game.board.fen(), fen)
+            self.wait()
+        finally:
+            os.chdir(cwd)
+        self.assertEqual(self.game.board.fen(), fen)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,621 @@
+import pygame
+import sys
+import chess
+import time
+
+from core.settings import *
+from core.events import game_events
+from core.game_state import GameState
+from core.material import MaterialTracker
+from pieces.piece_factory import PieceRenderer
+from ai.random_bot import RandomBot
+from ai.minimax_bot import MinimaxBot
+from ai.opening_book import OpeningBook, BookStrategy
+from ai.ponder import Ponderer
+from editor.board_builder import BoardBuilder
+from storage.save_worker import SaveManager
+from ui.board_layer import BoardLayers
+from ui.components import Button
+from ui.frame_stats import FrameStats
+
+STATE_MENU = "MENU"
+STATE_DIFFICULTY = "DIFFICULTY"
+STATE_GAME = "GAME"
+STATE_EDITOR = "EDITOR"
+
+SIDEBAR_X = WIDTH
+SIDEBAR_WIDTH = 350
+GAME_WIDTH = WIDTH + SIDEBAR_WIDTH
+GAME_HEIGHT = HEIGHT
+AI_MOVE_DELAY = 0.5
+MIN_SQUARE_SIZE = 40
+LAYOUT_CACHE_SIZE = 4
+
+
+class ChessApp:
+    def __init__(self):
+        pygame.init()
+        self.screen = pygame.display.set_mode((GAME_WIDTH, GAME_HEIGHT), pygame.RESIZABLE)
+
+        self.offsets = (0, 0)
+
+        pygame.display.set_caption("Smart Chess Game")
+        self.clock = pygame.time.Clock()
+
+        try:
+            self.background_image = pygame.image.load("assets/background.jpg")
+            self.using_bg_image = True
+        except Exception:
+            self.background_image = None
+            self.using_bg_image = False
+
+        self.game = GameState()
+        self.builder = BoardBuilder()
+        self.piece_renderer = PieceRenderer(self.game.theme)
+        self.material = MaterialTracker(self.game)
+
+        # Regions of the canvas are only redrawn when their content key changes, and only the
+        # redrawn rectangles are pushed to the display.
+        self.region_keys = {}
+        self.dirty_rects = []
+        self.full_redraw = True
+        self.drawn_state = None
+        self.frame_stats = FrameStats()
+        self.pending_frame = False
+        self.last_tick = time.perf_counter()
+
+        self.running = True
+        self.current_state = STATE_MENU
+        self.is_flipped = False
+
+        self.opening_book = OpeningBook(OPENING_BOOK_FILE)
+        self.minimax_bot = MinimaxBot(depth=3, workers=AI_SEARCH_WORKERS, telemetry=AI_TELEMETRY,
+                                      stats_log=AI_STATS_LOG)
+        self.bot_easy = BookStrategy(RandomBot(), self.opening_book)
+        self.bot_hard = BookStrategy(self.minimax_bot, self.opening_book)
+        self.ponderer = Ponderer(self.minimax_bot) if AI_PONDER else None
+        # The bot's tables are cleared for a new game; bots made elsewhere (engine, benchmarks) stay off the bus.
+        game_events.subscribe("game_reset", self.minimax_bot.on_game_reset)
+        self.ai_request = None
+        self.ai_request_position = None
+        self.ai_request_started = 0
+        self.ai_request_delay = AI_MOVE_DELAY
+        self.saves = SaveManager(self.game)
+        self.save_slot = 1
+
+        # Everything on the canvas is drawn at the window's resolution. Surfaces and fonts that depend
+        # on the size are built once per square size and reused until the window size changes again.
+        self.layouts = {}
+        self.window_size = None
+        self.square_size = None
+        self.apply_window_size(self.screen.get_size())
+
+        self.editor_brush = {'type': chess.PAWN, 'color': chess.WHITE}
+        game_events.subscribe("theme_changed", self.on_theme_changed)
+        for event_name in ("move_made", "game_reset", "game_loaded"):
+            game_events.subscribe(event_name, self.request_frame)
+
+    def on_theme_changed(self, data=None):
+        self.piece_renderer.set_theme(self.game.theme)
+
+    def request_frame(self, data=None):
+        self.pending_frame = True
+
+    def px(self, value):
+        return int(value * self.scale)
+
+    def apply_window_size(self, size):
+        self.window_size = size
+        square_size = max(MIN_SQUARE_SIZE, min(size[0] * SQUARE_SIZE // GAME_WIDTH, size[1] // 8))
+        if square_size == self.square_size:
+            return
+        self.square_size = square_size
+        self.scale = square_size / SQUARE_SIZE
+        self.board_size = square_size * 8
+        sidebar_width = self.px(SIDEBAR_WIDTH)
+        self.sidebar_rect = pygame.Rect(self.board_size, 0, sidebar_width, self.board_size)
+        self.white_clock_rect = pygame.Rect(self.board_size, 0, sidebar_width, self.px(85))
+        self.black_clock_rect = pygame.Rect(self.board_size, self.px(85), sidebar_width, self.px(150) - self.px(85))
+        self.sidebar_body_rect = pygame.Rect(self.board_size, self.px(150), sidebar_width,
+                                             self.board_size - self.px(150))
+
+        layout = self.layouts.pop(square_size, None)
+        if layout is None:
+            layout = self.build_layout((self.board_size + sidebar_width, self.board_size))
+            if len(self.layouts) >= LAYOUT_CACHE_SIZE:
+                dropped = next(iter(self.layouts))
+                del self.layouts[dropped]
+                self.piece_renderer.drop_square_size(dropped)
+        self.layouts[square_size] = layout
+        (self.canvas, self.background, self.sidebar_panel, self.board_layers,
+         (self.ui_font, self.clock_font, self.menu_font, self.large_font)) = layout
+        self.piece_renderer.set_square_size(square_size)
+        self.create_menus()
+        self.invalidate()
+
+    def build_layout(self, canvas_size):
+        canvas = pygame.Surface(canvas_size)
+        background = (30, 30, 30)
+        if self.background_image is not None:
+            background = pygame.transform.smoothscale(self.background_image, canvas_size)
+        sidebar_panel = pygame.Surface((canvas_size[0] - self.board_size, canvas_size[1]))
+        sidebar_panel.set_alpha(250)
+        sidebar_panel.fill((235, 235, 235))
+        fonts = (pygame.font.SysFont("Arial", self.px(20)),
+                 pygame.font.SysFont("Consolas", self.px(34), bold=True),
+                 pygame.font.SysFont("Arial", self.px(40), bold=True),
+                 pygame.font.SysFont("Arial", self.px(60), bold=True))
+        return canvas, background, sidebar_panel, BoardLayers(self.square_size), fonts
+
+    def create_menus(self):
+        px = self.px
+        center_x = self.canvas.get_width() // 2 - px(100)
+        self.btn_pvp = Button(center_x, px(300), px(200), px(60), "Human vs Human", self.ui_font, (50, 50, 50),
+                              HIGHLIGHT, self.set_mode_pvp)
+        self.btn_ai = Button(center_x, px(400), px(200), px(60), "Human vs AI", self.ui_font, (50, 50, 50),
+                             HIGHLIGHT, self.set_mode_ai_select)
+        self.btn_editor = Button(center_x, px(500), px(200), px(60), "Puzzle Editor", self.ui_font, (50, 50, 50),
+                                 HIGHLIGHT, self.set_mode_editor)
+        self.btn_exit = Button(center_x, px(600), px(200), px(60), "Exit", self.ui_font, (180, 50, 50),
+                               (255, 80, 80), self.quit_game)
+        self.btn_easy = Button(center_x, px(350), px(200), px(60), "Easy Mode", self.ui_font, (50, 150, 50),
+                               HIGHLIGHT, lambda: self.start_ai_game("Easy"))
+        self.btn_hard = Button(center_x, px(450), px(200), px(60), "Hard Mode", self.ui_font, (150, 50, 50),
+                               HIGHLIGHT, lambda: self.start_ai_game("Hard"))
+
+    def set_mode_pvp(self):
+        self.game.mode = "PVP"
+        self.game.reset()
+        self.current_state = STATE_GAME
+
+    def set_mode_ai_select(self):
+        self.current_state = STATE_DIFFICULTY
+
+    def set_mode_editor(self):
+        self.builder.clear()
+        self.current_state = STATE_EDITOR
+
+    def start_ai_game(self, difficulty):
+        self.game.mode = "AI"
+        self.game.ai_difficulty = difficulty
+        self.game.reset()
+        self.current_state = STATE_GAME
+
+    def quit_game(self):
+        self.cancel_ai_turn()
+        self.running = False
+
+    def return_to_menu(self):
+        self.cancel_ai_turn()
+        self.current_state = STATE_MENU
+
+    def position_key(self):
+        return self.game.board.fen(), len(self.game.history)
+
+    def cancel_ai_turn(self):
+        if self.ponderer is not None:
+            self.ponderer.stop()
+        if self.ai_request is not None:
+            self.ai_request.cancel()
+            self.ai_request = None
+            pygame.display.set_caption("Smart Chess Game")
+
+    def handle_ai_turn(self):
+        if self.ai_request is not None:
+            self.poll_ai_turn()
+            return
+        if self.game.board.is_game_over() or not self.game.game_active: return
+        if self.game.mode == "AI" and self.game.board.turn == chess.BLACK:
+            pygame.display.set_caption("Smart Chess Game - AI Thinking...")
+            self.ai_request_position = self.position_key()
+            self.ai_request_started = time.perf_counter()
+            # Short on time, the bot neither thinks nor pauses for longer than its clock allows.
+            self.ai_request_delay = min(AI_MOVE_DELAY, self.game.black_time * AI_MAX_CLOCK_FRACTION)
+            if self.game.ai_difficulty == "Easy":
+                self.ai_request = self.bot_easy.request_move(self.game.board)
+            else:
+                budget = MinimaxBot.budget_from_clock(self.game.black_time)
+                if self.ponderer is not None:
+                    self.ai_request = self.ponderer.take_hit(budget)
+                if self.ai_request is None:
+                    self.ai_request = self.bot_hard.request_move(self.game.board, time_limit=budget)
+
+    def poll_ai_turn(self):
+        if not self.ai_request.done() or time.perf_counter() - self.ai_request_started < self.ai_request_delay:
+            return
+        request, self.ai_request = self.ai_request, None
+        pygame.display.set_caption("Smart Chess Game")
+        try:
+            move = request.result()
+        except Exception as e:
+            print(f"ERROR: AI search failed. {e}")
+            return
+        if move and self.position_key() == self.ai_request_position:
+            if self.game.make_move(move) and self.ponderer is not None and self.game.ai_difficulty == "Hard":
+                self.ponderer.start(self.game.board)
+
+    def invalidate(self):
+        self.region_keys = {}
+        self.full_redraw = True
+
+    def region_changed(self, region, key, rect):
+        if self.region_keys.get(region) == key:
+            return False
+        self.region_keys[region] = key
+        self.dirty_rects.append(pygame.Rect(rect))
+        return True
+
+    def clear_region(self, rect):
+        if self.using_bg_image:
+            self.canvas.blit(self.background, rect, rect)
+        else:
+            self.canvas.fill((30, 30, 30), rect)
+
+    def present(self):
+        if self.full_redraw:
+            self.screen.fill((0, 0, 0))
+            self.screen.blit(self.canvas, self.offsets)
+            pygame.display.flip()
+        elif self.dirty_rects:
+            screen_rects = [rect.move(self.offsets) for rect in self.dirty_rects]
+            for rect, screen_rect in zip(self.dirty_rects, screen_rects):
+                self.screen.blit(self.canvas, screen_rect, rect)
+            pygame.display.update(screen_rects)
+        self.dirty_rects = []
+        self.full_redraw = False
+        self.piece_renderer.end_frame()
+
+    def frame_timeout(self):
+        # Seconds to block waiting for input, or None to keep running at FPS. Only a pending AI move
+        # needs polling every frame; otherwise the screen changes on input or when a clock ticks over.
+        if self.pending_frame or self.full_redraw or self.current_state != self.drawn_state:
+            return 0
+        if self.current_state != STATE_GAME:
+            return IDLE_MAX_WAIT
+        if self.ai_request is not None or self.saves.busy():
+            return None
+        if not self.game.game_active or self.game.board.is_game_over():
+            return IDLE_MAX_WAIT
+        remaining = self.game.white_time if self.game.board.turn == chess.WHITE else self.game.black_time
+        return min(IDLE_MAX_WAIT, remaining - int(remaining) + 0.001)
+
+    def wait_for_events(self):
+        timeout = self.frame_timeout()
+        self.pending_frame = False
+        if timeout is None:
+            self.clock.tick(FPS)
+            return pygame.event.get()
+        if timeout == 0:
+            return pygame.event.get()
+        event = pygame.event.wait(max(1, int(timeout * 1000)))
+        events = [] if event.type == pygame.NOEVENT else [event]
+        return events + pygame.event.get()
+
+    def run(self):
+        while self.running:
+            shown_state = self.current_state
+            events = self.wait_for_events()
+            # Clocks run on wall time, so their accuracy does not depend on how often frames are drawn.
+            now = time.perf_counter()
+            dt, self.last_tick = now - self.last_tick, now
+            self.saves.poll()
+            self.minimax_bot.publish_stats()
+
+            for event in events:
+                if event.type == pygame.VIDEORESIZE:
+                    self.apply_window_size(event.size)
+                if event.type == pygame.KEYDOWN and event.key == pygame.K_f:
+                    pygame.display.toggle_fullscreen()
+                    self.apply_window_size(self.screen.get_size())
+
+            real_mx, real_my = pygame.mouse.get_pos()
+            current_w, current_h = self.screen.get_size()
+            canvas_w, canvas_h = self.canvas.get_size()
+
+            offset_x = (current_w - canvas_w) // 2
+            offset_y = (current_h - canvas_h) // 2
+            if (offset_x, offset_y) != self.offsets:
+                self.offsets = (offset_x, offset_y)
+                self.invalidate()
+
+            mouse_pos = (real_mx - offset_x, real_my - offset_y)
+
+            for event in events:
+                if event.type == pygame.QUIT: self.quit_game()
+                if event.type in (pygame.VIDEORESIZE, pygame.VIDEOEXPOSE):
+                    self.invalidate()
+                if event.type == pygame.MOUSEBUTTONDOWN:
+                    event.pos = (event.pos[0] - offset_x, event.pos[1] - offset_y)
+
+            if self.current_state != self.drawn_state:
+                self.drawn_state = self.current_state
+                self.invalidate()
+
+            if self.current_state == STATE_MENU:
+                self.draw_menu(events, mouse_pos)
+            elif self.current_state == STATE_DIFFICULTY:
+                self.draw_difficulty(events, mouse_pos)
+            elif self.current_state == STATE_GAME:
+                self.game.update_timer(dt)
+                self.handle_game_input(events, mouse_pos)
+                self.draw_game_screen()
+                self.handle_ai_turn()
+            elif self.current_state == STATE_EDITOR:
+                self.handle_editor_input(events, mouse_pos)
+                self.draw_editor_screen()
+
+            self.present()
+            self.frame_stats.record(shown_state)
+
+        if FRAME_REPORT:
+            print(self.frame_stats.report())
+        self.minimax_bot.shutdown()
+        self.saves.shutdown()
+        self.opening_book.close()
+        pygame.quit()
+        sys.exit()
+
+    def draw_menu(self, events, mouse_pos):
+        self.draw_button_screen("SMART CHESS GAME", [self.btn_pvp, self.btn_ai, self.btn_editor, self.btn_exit],
+                                events, mouse_pos)
+
+    def draw_difficulty(self, events, mouse_pos):
+        self.draw_button_screen("SELECT DIFFICULTY", [self.btn_easy, self.btn_hard], events, mouse_pos)
+
+    def draw_button_screen(self, title_text, buttons, events, mouse_pos):
+        for btn in buttons:
+            btn.update(mouse_pos)
+            for e in events: btn.check_click(e)
+        key = (title_text, tuple(btn.is_hovered for btn in buttons))
+        if not self.region_changed("screen", key, self.canvas.get_rect()):
+            return
+        self.clear_region(self.canvas.get_rect())
+        title = self.menu_font.render(title_text, True, WHITE)
+        self.canvas.blit(title, title.get_rect(center=(self.canvas.get_width() // 2, self.px(150))))
+        for btn in buttons:
+            btn.draw(self.canvas)
+
+    def handle_game_input(self, events, mouse_pos):
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE: self.return_to_menu()
+                if event.key == pygame.K_t: self.game.toggle_theme()
+                ctrl = pygame.key.get_mods() & pygame.KMOD_CTRL
+                if event.key == pygame.K_s and ctrl: self.saves.save(self.save_slot)
+                if event.key == pygame.K_l and ctrl:
+                    self.cancel_ai_turn()
+                    self.saves.load(self.save_slot)
+                if ctrl and pygame.K_1 <= event.key <= pygame.K_9 and event.key - pygame.K_0 <= self.saves.slot_count:
+                    self.save_slot = event.key - pygame.K_0
+                    print(self.saves.describe(self.save_slot))
+                if event.key == pygame.K_o: self.is_flipped = not self.is_flipped
+
+                if event.key == pygame.K_r:
+                    self.cancel_ai_turn()
+                    self.game.reset()
+
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                if self.game.mode == "AI" and self.game.board.turn == chess.BLACK: return
+                if not self.game.board.is_game_over() and self.game.game_active:
+                    x, y = mouse_pos
+                    if x < self.board_size:
+                        c_visual = x // self.square_size
+                        r_visual = y // self.square_size
+                        if self.is_flipped:
+                            c, r = 7 - c_visual, r_visual
+                        else:
+                            c, r = c_visual, 7 - r_visual
+                        clicked_sq = chess.square(c, r)
+
+                        if self.game.selected_square is None:
+                            p = self.game.board.piece_at(clicked_sq)
+                            if p and p.color == self.game.board.turn: self.game.selected_square = clicked_sq
+                        else:
+                            move = self.game.legal_moves.find(self.game.selected_square, clicked_sq)
+                            if move and self.game.make_move(move):
+                                self.game.selected_square = None
+                            else:
+                                p = self.game.board.piece_at(clicked_sq)
+                                if p and p.color == self.game.board.turn:
+                                    self.game.selected_square = clicked_sq
+                                else:
+                                    self.game.selected_square = None
+
+    def format_time(self, seconds):
+        mins = int(seconds) // 60
+        secs = int(seconds) % 60
+        return f"{mins:02}:{secs:02}"
+
+    def draw_sidebar_logic(self, is_editor):
+        # The sidebar is split into parts that are re-rendered only when their own content changes:
+        # each clock once per second, the check warning, captures and history after a move.
+        x_start = self.board_size + self.px(20)
+        TEXT_COLOR = (20, 20, 20)
+
+        if is_editor:
+            if self.region_changed("sidebar", "editor", self.sidebar_rect):
+                self.clear_sidebar(self.sidebar_rect)
+                lines = ["EDITOR MODE", "L-Click: Place", "R-Click: Delete", "T: Theme", "Enter: Play", "Esc: Menu"]
+                for i, line in enumerate(lines):
+                    t = self.ui_font.render(line, True, TEXT_COLOR)
+                    self.canvas.blit(t, (x_start, self.px(50 + i * 40)))
+            return
+
+        if self.region_changed("white_clock", int(self.game.white_time), self.white_clock_rect):
+            self.clear_sidebar(self.white_clock_rect)
+            self.draw_clock(chess.WHITE, 30)
+        if self.region_changed("black_clock", int(self.game.black_time), self.black_clock_rect):
+            self.clear_sidebar(self.black_clock_rect)
+            self.draw_clock(chess.BLACK, 90)
+        if self.region_changed("sidebar_body", (self.material.version, len(self.game.history), type(self.game.theme)),
+                               self.sidebar_body_rect):
+            self.clear_sidebar(self.sidebar_body_rect)
+            self.draw_sidebar_body(160)
+
+    def clear_sidebar(self, rect):
+        self.clear_region(rect)
+        self.canvas.blit(self.sidebar_panel, rect.topleft, (0, rect.y, rect.w, rect.h))
+
+    def draw_clock(self, color, y):
+        # Layout values below are in unscaled pixels, converted with px() as they are drawn.
+        px = self.px
+        x_start = self.board_size + px(20)
+        box = (x_start, px(y), px(SIDEBAR_WIDTH - 40), px(50))
+        if color == chess.WHITE:
+            pygame.draw.rect(self.canvas, (255, 255, 255), box, border_radius=px(8))
+            pygame.draw.rect(self.canvas, (100, 100, 100), box, max(1, px(2)), border_radius=px(8))
+            w_surf = self.clock_font.render(f"White: {self.format_time(self.game.white_time)}", True, BLACK)
+            self.canvas.blit(w_surf, (x_start + px(15), px(y + 8)))
+        else:
+            pygame.draw.rect(self.canvas, (40, 40, 40), box, border_radius=px(8))
+            b_surf = self.clock_font.render(f"Black: {self.format_time(self.game.black_time)}", True, WHITE)
+            self.canvas.blit(b_surf, (x_start + px(15), px(y + 7)))
+
+    def draw_sidebar_body(self, y_cursor):
+        px = self.px
+        x_start = self.board_size + px(20)
+        content_width = SIDEBAR_WIDTH - 40
+        TEXT_COLOR = (20, 20, 20)
+        SUB_TEXT_COLOR = (60, 60, 60)
+
+        if self.game.board.is_check():
+            warn_surf = self.large_font.render("CHECK!", True, (200, 0, 0))
+            warn_rect = warn_surf.get_rect(center=(x_start + px(content_width // 2), px(y_cursor + 35)))
+            self.canvas.blit(warn_surf, warn_rect)
+            y_cursor += 70
+        else:
+            y_cursor += 10
+
+        for color, label in ((chess.BLACK, "Black Lost:"), (chess.WHITE, "White Lost:")):
+            missing = self.material.missing[color]
+            if not missing:
+                continue
+            header = self.ui_font.render(label, True, SUB_TEXT_COLOR)
+            self.canvas.blit(header, (x_start, px(y_cursor)))
+            y_cursor += 50
+            for i, p_type in enumerate(missing):
+                cx, cy = x_start + px(20 + (i % 8) * 40), px(y_cursor + (i // 8) * 40)
+                img = self.piece_renderer.get_small_image_by_type(p_type, color)
+                if img: self.canvas.blit(img, img.get_rect(center=(cx, cy)))
+            y_cursor += ((len(missing) - 1) // 8 + 1) * 40 + 20
+
+        y_cursor += 10
+        hist_header = self.ui_font.render("Last Moves:", True, (0, 50, 150))
+        self.canvas.blit(hist_header, (x_start, px(y_cursor)))
+        y_cursor += 30
+        recent_history = self.game.history[-8:]
+        for i in range(0, len(recent_history), 2):
+            turn_num = (len(self.game.history) - len(recent_history) + i) // 2 + 1
+            w_move = recent_history[i]
+            b_move = recent_history[i + 1] if i + 1 < len(recent_history) else ""
+            t = self.ui_font.render(f"{turn_num}. {w_move}   {b_move}", True, TEXT_COLOR)
+            self.canvas.blit(t, (x_start + px(10), px(y_cursor)))
+            y_cursor += 25
+
+    def board_key(self, board, selection):
+        last_move = board.peek() if board.move_stack else None
+        return board.fen(), last_move, selection, type(self.game.theme), self.is_flipped
+
+    def draw_game_screen(self):
+        board_key = self.board_key(self.game.board, self.game.selected_square)
+        if not self.game.game_active:
+            # The popup darkens the whole canvas, so it is drawn once over a fresh board and sidebar,
+            # and everything is redrawn once it goes away.
+            popup_key = (board_key, self.material.version, int(self.game.white_time), int(self.game.black_time))
+            if self.region_changed("screen", popup_key, self.canvas.get_rect()):
+                self.region_keys = {"screen": popup_key}
+                self.draw_board_logic(self.game.board, self.game.theme, self.game.selected_square,
+                                      self.piece_renderer)
+                self.draw_sidebar_logic(False)
+                self.draw_game_over_popup()
+                self.region_keys = {"screen": popup_key}
+            return
+        self.region_keys.pop("screen", None)
+        if self.region_changed("board", board_key, (0, 0, self.board_size, self.board_size)):
+            self.draw_board_logic(self.game.board, self.game.theme, self.game.selected_square, self.piece_renderer)
+        self.draw_sidebar_logic(False)
+
+    def draw_game_over_popup(self):
+        overlay = pygame.Surface(self.canvas.get_size())
+        overlay.set_alpha(180)
+        overlay.fill((0, 0, 0))
+        self.canvas.blit(overlay, (0, 0))
+        if self.game.white_time <= 0:
+            msg, color = "BLACK WINS (Time)", (100, 100, 255)
+        elif self.game.black_time <= 0:
+            msg, color = "WHITE WINS (Time)", (255, 255, 255)
+        else:
+            outcome = self.game.board.outcome()
+            if outcome and outcome.winner == chess.WHITE:
+                msg, color = "WHITE WINS!", (255, 255, 255)
+            elif outcome and outcome.winner == chess.BLACK:
+                msg, color = "BLACK WINS!", (100, 100, 255)
+            else:
+                msg, color = "DRAW", (200, 200, 200)
+
+        px = self.px
+        box_rect = pygame.Rect(0, 0, px(500), px(250))
+        box_rect.center = self.canvas.get_rect().center
+        pygame.draw.rect(self.canvas, (40, 40, 40), box_rect, border_radius=px(20))
+        pygame.draw.rect(self.canvas, HIGHLIGHT, box_rect, max(1, px(4)), border_radius=px(20))
+        text_surf = self.large_font.render(msg, True, color)
+        self.canvas.blit(text_surf, text_surf.get_rect(center=(box_rect.centerx, box_rect.centery - px(40))))
+        sub_surf = self.ui_font.render("Press 'R' to Restart or 'Esc' for Menu", True, (180, 180, 180))
+        self.canvas.blit(sub_surf, sub_surf.get_rect(center=(box_rect.centerx, box_rect.centery + px(50))))
+
+    def handle_editor_input(self, events, mouse_pos):
+        for event in events:
+            if event.type == pygame.KEYDOWN:
+                if event.key == pygame.K_ESCAPE: self.return_to_menu()
+                if event.key == pygame.K_t: self.game.toggle_theme()
+                if event.key == pygame.K_1: self.editor_brush['type'] = chess.PAWN
+                if event.key == pygame.K_2: self.editor_brush['type'] = chess.KNIGHT
+                if event.key == pygame.K_3: self.editor_brush['type'] = chess.BISHOP
+                if event.key == pygame.K_4: self.editor_brush['type'] = chess.ROOK
+                if event.key == pygame.K_5: self.editor_brush['type'] = chess.QUEEN
+                if event.key == pygame.K_6: self.editor_brush['type'] = chess.KING
+                if event.key == pygame.K_c: self.editor_brush['color'] = not self.editor_brush['color']
+                if event.key == pygame.K_RETURN:
+                    new_board = self.builder.build()
+                    if new_board:
+                        self.game.set_position(new_board)
+                        self.current_state = STATE_GAME
+            if event.type == pygame.MOUSEBUTTONDOWN:
+                x, y = mouse_pos
+                if x < self.board_size:
+                    c, r = x // self.square_size, y // self.square_size
+                    clicked_sq = chess.square(c, 7 - r)
+                    if event.button == 1:
+                        self.builder.add_piece(self.editor_brush['type'], clicked_sq, self.editor_brush['color'])
+                    elif event.button == 3:
+                        self.builder.remove_piece(clicked_sq)
+
+    def draw_editor_screen(self):
+        preview = self.builder.get_preview()
+        if self.region_changed("board", self.board_key(preview, None), (0, 0, self.board_size, self.board_size)):
+            self.draw_board_logic(preview, self.game.theme, None, self.piece_renderer)
+        self.draw_sidebar_logic(True)
+
+    def draw_board_logic(self, board, theme, selection, renderer):
+        layers = self.board_layers
+        base, selected = layers.get(theme, self.is_flipped)
+        self.canvas.blit(base, (0, 0))
+
+        if selection is not None:
+            rect = layers.square_rect(selection, self.is_flipped)
+            self.canvas.blit(selected, rect, rect)
+        if board.move_stack:
+            last_move = board.peek()
+            for sq_idx in (last_move.from_square, last_move.to_square):
+                self.canvas.blit(layers.last_move_tint, layers.square_rect(sq_idx, self.is_flipped))
+        if selection is not None:
+            for move in self.game.legal_moves.from_square(selection):
+                if move.promotion in (None, chess.QUEEN):
+                    rect = layers.square_rect(move.to_square, self.is_flipped)
+                    pygame.draw.circle(self.canvas, (100, 100, 100, 100), rect.center, self.square_size // 6)
+
+        for sq_idx, piece in board.piece_map().items():
+            img = renderer.get_image(piece)
+            if img:
+                rect = layers.square_rect(sq_idx, self.is_flipped)
+                self.canvas.blit(img, img.get_rect(center=rect.center))
@@ -0,0 +1,53 @@
+import chess
+import pygame
+from core.settings import SQUARE_SIZE
+
+
+class BoardLayers:
+    # Board backgrounds (squares and coordinates) rendered once per theme and orientation.
+    # The "selected" layer has every square in the highlight colour, so a selection is one area blit.
+    def __init__(self, square_size=SQUARE_SIZE):
+        self.square_size = square_size
+        self.scale = square_size / SQUARE_SIZE
+        self.coord_font = pygame.font.SysFont("Arial", max(8, int(14 * self.scale)), bold=True)
+        self.cache = {}
+        self.last_move_tint = pygame.Surface((square_size, square_size))
+        self.last_move_tint.set_alpha(100)
+        self.last_move_tint.fill((255, 255, 0))
+
+    def get(self, theme, flipped):
+        key = (type(theme), flipped)
+        if key not in self.cache:
+            self.cache[key] = (self.render(theme, flipped, False), self.render(theme, flipped, True))
+        return self.cache[key]
+
+    def square_rect(self, square, flipped):
+        if flipped:
+            c, r = 7 - chess.square_file(square), chess.square_rank(square)
+        else:
+            c, r = chess.square_file(square), 7 - chess.square_rank(square)
+        return pygame.Rect(c * self.square_size, r * self.square_size, self.square_size, self.square_size)
+
+    def render(self, theme, flipped, selected):
+        size = self.square_size
+        right, bottom, margin = int(15 * self.scale), int(18 * self.scale), int(3 * self.scale)
+        surface = pygame.Surface((size * 8, size * 8))
+        for r in range(8):
+            for c in range(8):
+                color = theme.get_light_square_color() if (r + c) % 2 == 0 else theme.get_dark_square_color()
+                if selected:
+                    color = theme.get_highlight_color()
+                if flipped:
+                    file_label, rank_label = chess.FILE_NAMES[7 - c], str(r + 1)
+                else:
+                    file_label, rank_label = chess.FILE_NAMES[c], str(8 - r)
+
+                pygame.draw.rect(surface, color, (c * size, r * size, size, size))
+
+                tc = theme.get_dark_square_color() if (r + c) % 2 == 0 else theme.get_light_square_color()
+                if r == 7:
+                    surface.blit(self.coord_font.render(file_label, True, tc),
+                                 (c * size + size - right, r * size + size - bottom))
+                if c == 0:
+                    surface.blit(self.coord_font.render(rank_label, True, tc), (c * size + margin, r * size + margin))
+        return surface
@@ -0,0 +1,25 @@
+import time
+
+
+class FrameStats:
+    # Frames, wall time and process CPU time accumulated per screen state, to check what each screen costs.
+    def __init__(self):
+        self.screens = {}
+        self.last_wall = time.perf_counter()
+        self.last_cpu = time.process_time()
+
+    def record(self, state):
+        wall, cpu = time.perf_counter(), time.process_time()
+        entry = self.screens.setdefault(state, [0, 0.0, 0.0])
+        entry[0] += 1
+        entry[1] += wall - self.last_wall
+        entry[2] += cpu - self.last_cpu
+        self.last_wall, self.last_cpu = wall, cpu
+
+    def report(self):
+        lines = []
+        for state, (frames, wall, cpu) in self.screens.items():
+            if wall > 0:
+                lines.append(f"{state:<10} {frames:6} frames {wall:8.1f}s {frames / wall:7.1f} FPS "
+                             f"{100 * cpu / wall:5.1f}% CPU")
+        return "\n".join(lines)